@@ -56,6 +56,10 @@ local PARTY_SIZE = 600
 local POKEMON_SIZE = 100
 local POKEMON_HP_OFFSET = 86
 
+-- ROM address space (cart0 is mapped at 0x08000000, up to 32 MB)
+local ROM_BASE = 0x08000000
+local ROM_END = 0x0A000000
+
 -- Buffer relay constants (GBA-PK reads 256 bytes for both bufA and bufB per battler)
 local BUFFER_READ_SIZE = 256    -- bytes to read/relay from bufferA/B per battler
 local BATTLER_BUFFER_STRIDE = 0x200  -- 512 bytes per battler slot
@@ -75,6 +79,19 @@ local CMD_GET_AWAY_EXIT = 0x37
 -- Battle outcome flags
 local B_OUTCOME_LINK_BATTLE_RAN = 0x80  -- OR'd into gBattleOutcome when Run is used in link battle
 
+-- gScriptLoad contents for "no script" (GBA-PK RemoveScriptFromMemory: mode=513, ptr=0)
+local SCRIPT_LOAD_CLEAR = {0, 0, 513, 0, 0, 0, 0, 0, 0, 0, 0, 0}
+
+-- ROM NOP patches re-verified periodically while STARTING (cart0 offsets)
+local STARTING_NOP_CHECKS = {
+  { off = 0x032494, name = "HLS_SBV" },
+  { off = 0x032496, name = "HLS_SBV2" },
+  { off = 0x036456, name = "HLS_CB2" },
+  { off = 0x036458, name = "HLS_CB22" },
+  { off = 0x0007BC, name = "TryRecv" },
+  { off = 0x0007BE, name = "TryRecv2" },
+}
+
 -- Helper: convert absolute EWRAM address to WRAM offset
 local function toWRAMOffset(address)
   return address - 0x02000000
@@ -90,53 +107,43 @@ local function isIWRAM(address)
   return address >= 0x03000000 and address < 0x03008000
 end
 
--- Helper: read from the correct memory domain
-local function readMem8(address)
+-- Helper: memory domain and domain offset for an absolute EWRAM/IWRAM address
+local function memDomain(address)
   if isIWRAM(address) then
-    return emu.memory.iwram:read8(toIWRAMOffset(address))
-  else
-    return emu.memory.wram:read8(toWRAMOffset(address))
+    return emu.memory.iwram, toIWRAMOffset(address)
   end
+  return emu.memory.wram, toWRAMOffset(address)
+end
+
+-- Helpers: read/write through the correct memory domain
+local function readMem8(address)
+  local domain, offset = memDomain(address)
+  return domain:read8(offset)
 end
 
 local function readMem16(address)
-  if isIWRAM(address) then
-    return emu.memory.iwram:read16(toIWRAMOffset(address))
-  else
-    return emu.memory.wram:read16(toWRAMOffset(address))
-  end
+  local domain, offset = memDomain(address)
+  return domain:read16(offset)
 end
 
 local function readMem32(address)
-  if isIWRAM(address) then
-    return emu.memory.iwram:read32(toIWRAMOffset(address))
-  else
-    return emu.memory.wram:read32(toWRAMOffset(address))
-  end
+  local domain, offset = memDomain(address)
+  return domain:read32(offset)
 end
 
 local function writeMem8(address, value)
-  if isIWRAM(address) then
-    emu.memory.iwram:write8(toIWRAMOffset(address), value)
-  else
-    emu.memory.wram:write8(toWRAMOffset(address), value)
-  end
+  local domain, offset = memDomain(address)
+  domain:write8(offset, value)
 end
 
 local function writeMem16(address, value)
-  if isIWRAM(address) then
-    emu.memory.iwram:write16(toIWRAMOffset(address), value)
-  else
-    emu.memory.wram:write16(toWRAMOffset(address), value)
-  end
+  local domain, offset = memDomain(address)
+  domain:write16(offset, value)
 end
 
 local function writeMem32(address, value)
-  if isIWRAM(address) then
-    emu.memory.iwram:write32(toIWRAMOffset(address), value)
-  else
-    emu.memory.wram:write32(toWRAMOffset(address), value)
-  end
+  local domain, offset = memDomain(address)
+  domain:write32(offset, value)
 end
 
 -- Forward declarations (defined after startLinkBattle, called from within it)
@@ -330,15 +337,18 @@ function Battle.init(gameConfig, halModule)
       Battle.setDebugOptions(config.debug.battle)
     end
 
-    console:log("[Battle] Initialized (GBA-PK buffer relay mode)")
-    console:log(string.format("[Battle] gPlayerParty=0x%08X gEnemyParty=0x%08X",
-      ADDRESSES.gPlayerParty or 0, ADDRESSES.gEnemyParty or 0))
-
+    -- One console:log for the init summary (the console redraws on every call)
+    local initLines = {
+      "[Battle] Initialized (GBA-PK buffer relay mode)",
+      string.format("[Battle] gPlayerParty=0x%08X gEnemyParty=0x%08X",
+        ADDRESSES.gPlayerParty or 0, ADDRESSES.gEnemyParty or 0),
+    }
     if LINK and LINK.CB2_InitBattle then
-      console:log(string.format("[Battle] CB2_InitBattle=0x%08X", LINK.CB2_InitBattle))
+      initLines[#initLines + 1] = string.format("[Battle] CB2_InitBattle=0x%08X", LINK.CB2_InitBattle)
     else
-      console:log("[Battle] WARNING: CB2_InitBattle not configured -- run find_cb2_initbattle.lua")
+      initLines[#initLines + 1] = "[Battle] WARNING: CB2_InitBattle not configured -- run find_cb2_initbattle.lua"
     end
+    console:log(table.concat(initLines, "\n"))
 
     -- Clean up stale ROM patches from previous sessions
     Battle.cleanupStalePatches()
@@ -396,6 +406,7 @@ function Battle.cleanupStalePatches()
     { name = "nopTryRecvLinkBattleData_lo", patchVal = 0x46C0, origVal = nil, sz = 2, romOffset = 0x0007BE },
   }
 
+  local warnings = {}
   for _, pr in ipairs(patchRestore) do
     local patch = LINK.patches and LINK.patches[pr.name]
     local offset = (patch and patch.romOffset) or pr.romOffset
@@ -409,20 +420,24 @@ function Battle.cleanupStalePatches()
       elseif pr.sz == 4 then
         local ok, cur = pcall(function() return emu.memory.cart0:read32(offset) end)
         if ok and cur == pr.patchVal then
-          console:log(string.format("[Battle] WARNING: %s still patched (restart mGBA)", pr.name))
+          warnings[#warnings + 1] = string.format("[Battle] WARNING: %s still patched (restart mGBA)", pr.name)
         end
       end
     end
   end
 
   if LINK.GetMultiplayerId then
-    local gmidOff = (LINK.GetMultiplayerId & 0xFFFFFFFE) - 0x08000000
+    local gmidOff = (LINK.GetMultiplayerId & 0xFFFFFFFE) - ROM_BASE
     local ok, instr = pcall(function() return emu.memory.cart0:read16(gmidOff) end)
     if ok and (instr == 0x2000 or instr == 0x2001) then
-      console:log("[Battle] WARNING: GetMultiplayerId still patched -- restart mGBA for clean ROM")
+      warnings[#warnings + 1] = "[Battle] WARNING: GetMultiplayerId still patched -- restart mGBA for clean ROM"
     end
   end
 
+  if #warnings > 0 then
+    console:log(table.concat(warnings, "\n"))
+  end
+
   if cleaned > 0 then
     console:log(string.format("[Battle] Cleaned %d stale ROM patches", cleaned))
   end
@@ -435,16 +450,14 @@ end
 function Battle.readLocalParty()
   if not ADDRESSES or not ADDRESSES.gPlayerParty then return nil end
 
-  local data = {}
   local baseOffset = toWRAMOffset(ADDRESSES.gPlayerParty)
 
-  local ok = pcall(function()
-    for i = 0, PARTY_SIZE - 1 do
-      data[i + 1] = emu.memory.wram:read8(baseOffset + i)
-    end
-  end)
-
-  if ok and #data == PARTY_SIZE then return data end
+  -- Whole party in one readRange instead of 600 read8 calls
+  local wram = emu.memory.wram
+  local ok, bytes = pcall(wram.readRange, wram, baseOffset, PARTY_SIZE)
+  if ok and bytes and #bytes == PARTY_SIZE then
+    return { string.byte(bytes, 1, PARTY_SIZE) }
+  end
   return nil
 end
 
@@ -621,7 +634,7 @@ function Battle.applyPatches(isMaster)
 
   -- ROM patch: GetMultiplayerId -> MOV R0,#n; BX LR
   if LINK and LINK.GetMultiplayerId then
-    local romOff = (LINK.GetMultiplayerId & 0xFFFFFFFE) - 0x08000000
+    local romOff = (LINK.GetMultiplayerId & 0xFFFFFFFE) - ROM_BASE
     local movValue = isMaster and 0x2000 or 0x2001
     if applyROMPatch(romOff, movValue, 2) then
       romPatchWorks = true
@@ -633,14 +646,19 @@ function Battle.applyPatches(isMaster)
 
   -- Additional ROM patches (BEQ->B skips, NOP patches)
   if romPatchWorks and LINK and LINK.patches then
+    -- One console:log for the whole batch (the console redraws on every call)
+    local appliedLines = {}
     for name, patch in pairs(LINK.patches) do
       if patch.romOffset and patch.value and patch.size then
         if applyROMPatch(patch.romOffset, patch.value, patch.size) then
           patchCount = patchCount + 1
-          console:log(string.format("[Battle] Applied ROM patch: %s", name))
+          appliedLines[#appliedLines + 1] = string.format("[Battle] Applied ROM patch: %s", name)
         end
       end
     end
+    if #appliedLines > 0 then
+      console:log(table.concat(appliedLines, "\n"))
+    end
   end
 
   console:log(string.format("[Battle] Applied %d patches (%d ROM, %d RAM)",
@@ -808,7 +826,7 @@ function Battle.startLinkBattle(isMaster)
 
   -- Save callback1 so we can restore it after battle
   local ok1, cb1 = pcall(readMem32, gMainBase + 0x00)
-  if ok1 and cb1 >= 0x08000000 and cb1 < 0x0A000000 then
+  if ok1 and cb1 >= ROM_BASE and cb1 < ROM_END then
     state.savedCallback1 = cb1
     console:log(string.format("[Battle] Saved callback1 = 0x%08X", cb1))
   end
@@ -874,13 +892,11 @@ end
 -- Buffer Relay Helpers
 -- ============================================================
 
+-- One readRange for the whole block (size <= 4096), expanded to a byte array
 local function readEWRAMBlock(addr, size)
-  local offset = toWRAMOffset(addr)
-  local data = {}
-  local ok = pcall(function()
-    for i = 0, size - 1 do data[i + 1] = emu.memory.wram:read8(offset + i) end
-  end)
-  if ok and #data == size then return data end
+  local wram = emu.memory.wram
+  local ok, bytes = pcall(wram.readRange, wram, toWRAMOffset(addr), size)
+  if ok and bytes and #bytes == size then return { string.byte(bytes, 1, size) } end
   return nil
 end
 
@@ -1110,6 +1126,21 @@ local GBA_NAME_PLAYER = {0xCA, 0xC6, 0xBB, 0xD3, 0xBF, 0xCC, 0xFF, 0x00}  -- "PL
 local GBA_NAME_RIVAL  = {0xCC, 0xC3, 0xD5, 0xBB, 0xC6, 0xFF, 0x00, 0x00}  -- "RIVAL" + terminator
 
 -- Cached real player name (read once from SaveBlock2 via initLocalLinkPlayer)
+-- GBA text byte -> printable form for debug logs (A=0xBB, a=0xD5, space=0x00),
+-- precomputed for all 256 values; other bytes print as <XX>
+local GBA_NAME_LOG_CHARS = {}
+for b = 0, 255 do
+  if b >= 0xBB and b <= 0xD4 then
+    GBA_NAME_LOG_CHARS[b] = string.char(0x41 + (b - 0xBB))
+  elseif b >= 0xD5 and b <= 0xEE then
+    GBA_NAME_LOG_CHARS[b] = string.char(0x61 + (b - 0xD5))
+  elseif b == 0x00 then
+    GBA_NAME_LOG_CHARS[b] = " "
+  else
+    GBA_NAME_LOG_CHARS[b] = string.format("<%02X>", b)
+  end
+end
+
 local cachedLocalName = nil
 local cachedLocalGender = 0
 local cachedLocalTrainerId = 0
@@ -1192,21 +1223,13 @@ initLocalLinkPlayer = function()
   end)
 
   -- Log the decoded name for debugging
-  local nameStr = ""
+  local nameChars = {}
   for i = 1, 7 do
     local b = playerName[i]
     if b == 0xFF then break end
-    -- GBA text: A=0xBB, a=0xD5, space=0x00
-    if b >= 0xBB and b <= 0xD4 then
-      nameStr = nameStr .. string.char(string.byte("A") + (b - 0xBB))
-    elseif b >= 0xD5 and b <= 0xEE then
-      nameStr = nameStr .. string.char(string.byte("a") + (b - 0xD5))
-    elseif b == 0x00 then
-      nameStr = nameStr .. " "
-    else
-      nameStr = nameStr .. string.format("<%02X>", b)
-    end
+    nameChars[#nameChars + 1] = GBA_NAME_LOG_CHARS[b]
   end
+  local nameStr = table.concat(nameChars)
   console:log(string.format("[Battle] initLocalLinkPlayer: name='%s' gender=%d trainerId=0x%08X", nameStr, gender, trainerId))
   return true
 end
@@ -1218,10 +1241,8 @@ end
 
 local function loadscriptClear()
     if not (LINK and LINK.gScriptLoad) then return end
-    -- GBA-PK RemoveScriptFromMemory: mode=513, ptr=0 = disabled
-    local clearData = {0, 0, 513, 0, 0, 0, 0, 0, 0, 0, 0, 0}
     local slOff = LINK.gScriptLoad - 0x03000000
-    for i, w in ipairs(clearData) do
+    for i, w in ipairs(SCRIPT_LOAD_CLEAR) do
         emu.memory.iwram:write32(slOff + (i-1)*4, w)
     end
 end
@@ -1296,11 +1317,13 @@ local function killLinkTasks()
   local killedTasks = 0
   local activeTasks = {}
   pcall(function()
+    -- Whole gTasks array in one readRange, then one pass over the task records
+    local iwram = emu.memory.iwram
+    local tasks = iwram:readRange(toIWRAMOffset(GTASKS_ADDR), TASK_COUNT * TASK_SIZE)
     for i = 0, TASK_COUNT - 1 do
       local taskBase = GTASKS_ADDR + i * TASK_SIZE
-      local isActive = emu.memory.iwram:read8(toIWRAMOffset(taskBase) + 4)
+      local func, isActive = string.unpack("<I4B", tasks, i * TASK_SIZE + 1)
       if isActive == 1 then
-        local func = emu.memory.iwram:read32(toIWRAMOffset(taskBase))
         table.insert(activeTasks, { idx = i, func = func })
 
         -- Kill tasks in link/comm ROM range (0x08025000-0x0804A000)
@@ -1311,7 +1334,7 @@ local function killLinkTasks()
         local isLinkRange = (funcBase >= 0x08025000 and funcBase < 0x0804A000)
 
         if isLinkRange then
-          emu.memory.iwram:write32(toIWRAMOffset(taskBase), TASK_DUMMY)
+          iwram:write32(toIWRAMOffset(taskBase), TASK_DUMMY)
           killedTasks = killedTasks + 1
         end
       end
@@ -1598,15 +1621,7 @@ function Battle.tick()
       -- Verify NOP patches every 30 frames in STARTING
       local nopOk = true
       if state.stageTimer % 30 == 1 then
-        local nopChecks = {
-          { off = 0x032494, name = "HLS_SBV" },
-          { off = 0x032496, name = "HLS_SBV2" },
-          { off = 0x036456, name = "HLS_CB2" },
-          { off = 0x036458, name = "HLS_CB22" },
-          { off = 0x0007BC, name = "TryRecv" },
-          { off = 0x0007BE, name = "TryRecv2" },
-        }
-        for _, nc in ipairs(nopChecks) do
+        for _, nc in ipairs(STARTING_NOP_CHECKS) do
           local okR, v = pcall(emu.memory.cart0.read16, emu.memory.cart0, nc.off)
           if okR and v ~= 0x46C0 then
             nopOk = false
@@ -34,6 +34,18 @@ local FACING = {
   LEFT = 3,
   RIGHT = 4,
 }
+-- Key info used when update() only gets a boolean for A (no edges pressed).
+-- Shared and read-only, so the per-frame call doesn't rebuild it.
+local NO_KEY_INFO = {
+  a = false,
+  b = false,
+  pressedA = false,
+  pressedB = false,
+  pressedUp = false,
+  pressedDown = false,
+  pressedLeft = false,
+  pressedRight = false,
+}
 
 -- Textbox module reference (set by init)
 local Textbox = nil
@@ -341,16 +353,7 @@ end
          | {action = "decline", requesterId} | {action = "cancel"}
 ]]
 function Duel.update(frameCounter, keyA)
-  local keyInfo = {
-    a = false,
-    b = false,
-    pressedA = false,
-    pressedB = false,
-    pressedUp = false,
-    pressedDown = false,
-    pressedLeft = false,
-    pressedRight = false,
-  }
+  local keyInfo = NO_KEY_INFO
   if type(keyA) == "table" then
     keyInfo = keyA
     keyA = keyInfo.a
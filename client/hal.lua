@@ -35,11 +35,25 @@ local ghostOamBaseIndex = GHOST_OAM_BASE_DEFAULT
 local ghostOamStrategy = "fixed"
 local ghostOamSlotCount = GHOST_OBJ_MAX_SLOTS
 local dynamicGhostOAMIndices = nil
+local dynamicGhostOAMIndexSet = nil  -- OAM index -> true, mirrors dynamicGhostOAMIndices
 local dynamicOAMFallbackWarned = false
 local mapHeaderAddr = nil
 local mapHeaderScanAttempts = 0
 local mapHeaderCandidateAddr = nil
 local mapHeaderCandidateFrames = 0
+-- readMapLayoutSize results keyed by MapLayout pointer ({width, height} or false).
+-- Layouts live in ROM and never change, while the per-frame header validation and
+-- projection reads ask for the same one repeatedly. Rebound in HAL.init to the
+-- per-cartridge tables kept across script reloads.
+local mapLayoutSizeCache = {}
+-- Decoded MapConnections lists keyed by connections pointer, same ROM-immutable
+-- reasoning as mapLayoutSizeCache.
+local mapConnectionsCache = {}
+-- MapConnections {count, tablePtr} headers keyed by pointer, for header validation
+local mapConnectionsHeaderCache = {}
+-- Literal-pool refs per 32-bit value (cart0 offsets), filled by findROMLiteralRefs.
+-- Rebound in HAL.init to the per-cartridge table, like the map caches above.
+local romLiteralRefs = {}
 local learnedOverworldCb2 = nil
 local lastPosForOverworldLearn = nil
 local lastLearnedOverworldCb2Log = nil
@@ -100,6 +114,20 @@ local function copyArray(values)
   return out
 end
 
+-- Set the dynamic ghost OAM indices and rebuild their reverse lookup set.
+local function setDynamicGhostOAMIndices(indices)
+  dynamicGhostOAMIndices = indices
+  if not indices then
+    dynamicGhostOAMIndexSet = nil
+    return
+  end
+  local set = {}
+  for i = 1, #indices do
+    set[indices[i]] = true
+  end
+  dynamicGhostOAMIndexSet = set
+end
+
 local function fixedGhostOAMIndex(slot)
   local idx = ghostOamBaseIndex + slot
   if idx < 0 or idx > 127 then
@@ -138,6 +166,18 @@ local function resolveOAMBufferAddress(gameConfig)
   return gMainBase + oamOffset
 end
 
+--[[
+  Identify the loaded cartridge for caches kept across script reloads:
+  cartridge header (title, game code, maker, version, checksum) and cart size.
+  @return string|nil Fingerprint, or nil if the header can't be read
+]]
+local function cartFingerprint()
+  local ok, header = pcall(emu.memory.cart0.readRange, emu.memory.cart0, 0xA0, 0x20)
+  if not ok or not header or #header < 0x20 then return nil end
+  local okSize, size = pcall(emu.memory.cart0.size, emu.memory.cart0)
+  return header .. "|" .. tostring(okSize and size or "?")
+end
+
 --[[
   Initialize HAL with game-specific configuration
   @param gameConfig Table containing memory offsets for the current ROM
@@ -149,6 +189,19 @@ function HAL.init(gameConfig)
   mapHeaderScanAttempts = 0
   mapHeaderCandidateAddr = nil
   mapHeaderCandidateFrames = 0
+  -- ROM-derived map caches survive script reloads on the same cartridge
+  -- (_G.__pokecoopMapRomCache), so a reload doesn't re-read layouts/connections
+  local fingerprint = cartFingerprint()
+  local romCache = _G.__pokecoopMapRomCache
+  if not fingerprint or not romCache or romCache.fingerprint ~= fingerprint then
+    romCache = { fingerprint = fingerprint, layoutSizes = {}, connections = {}, connectionHeaders = {} }
+    _G.__pokecoopMapRomCache = fingerprint and romCache or nil
+  end
+  romCache.literalRefs = romCache.literalRefs or {}
+  mapLayoutSizeCache = romCache.layoutSizes
+  mapConnectionsCache = romCache.connections
+  mapConnectionsHeaderCache = romCache.connectionHeaders
+  romLiteralRefs = romCache.literalRefs
   learnedOverworldCb2 = nil
   lastPosForOverworldLearn = nil
   lastLearnedOverworldCb2Log = nil
@@ -159,7 +212,7 @@ function HAL.init(gameConfig)
     ghostOamStrategy = "dynamic"
   end
   ghostOamSlotCount = clampGhostSlotCount(renderConfig and renderConfig.oamReservedCount)
-  dynamicGhostOAMIndices = nil
+  setDynamicGhostOAMIndices(nil)
   dynamicOAMFallbackWarned = false
 
   ghostOamBaseIndex = GHOST_OAM_BASE_DEFAULT
@@ -171,27 +224,30 @@ function HAL.init(gameConfig)
   if ghostOamBaseIndex + ghostOamSlotCount - 1 > 127 then
     ghostOamBaseIndex = 128 - ghostOamSlotCount
   end
-  console:log("[HAL] Initialized with config: " .. (gameConfig.name or "Unknown"))
+  -- Startup summary goes out as one block; the console redraws on every log call
+  local initLines = { "[HAL] Initialized with config: " .. (gameConfig.name or "Unknown") }
   if oamBufferAddr then
-    console:log(string.format("[HAL] Engine OAM buffer: 0x%08X", oamBufferAddr))
+    initLines[#initLines + 1] = string.format("[HAL] Engine OAM buffer: 0x%08X", oamBufferAddr)
   else
-    console:log("[HAL] Engine OAM buffer unknown (hardware OAM writes only)")
+    initLines[#initLines + 1] = "[HAL] Engine OAM buffer unknown (hardware OAM writes only)"
   end
   if ghostOamStrategy == "dynamic" then
-    console:log(string.format("[HAL] Ghost OAM strategy: dynamic (%d slots)", ghostOamSlotCount))
+    initLines[#initLines + 1] = string.format("[HAL] Ghost OAM strategy: dynamic (%d slots)", ghostOamSlotCount)
   else
-    console:log(string.format("[HAL] Ghost OAM reserve: [%d..%d]",
-      ghostOamBaseIndex, ghostOamBaseIndex + ghostOamSlotCount - 1))
+    initLines[#initLines + 1] = string.format("[HAL] Ghost OAM reserve: [%d..%d]",
+      ghostOamBaseIndex, ghostOamBaseIndex + ghostOamSlotCount - 1)
   end
   if config.warp then
-    console:log(string.format("[HAL] Warp config OK: callback2=0x%08X cb2LoadMap=0x%08X",
-      config.warp.callback2Addr, config.warp.cb2LoadMap))
+    initLines[#initLines + 1] = string.format("[HAL] Warp config OK: callback2=0x%08X cb2LoadMap=0x%08X",
+      config.warp.callback2Addr, config.warp.cb2LoadMap)
+    console:log(table.concat(initLines, "\n"))
     -- Scan ROM for WarpIntoMap address (needed for EWRAM trampoline)
     -- CB2_LoadMap alone hangs because gMapHeader isn't loaded.
     -- The trampoline calls WarpIntoMap + CB2_LoadMap from executable EWRAM.
     HAL.scanROMForWarpFunction()
   else
-    console:log("[HAL] WARNING: No warp config in profile — duel warp will not work")
+    initLines[#initLines + 1] = "[HAL] WARNING: No warp config in profile — duel warp will not work"
+    console:log(table.concat(initLines, "\n"))
   end
 end
 
@@ -266,15 +322,7 @@ function HAL.isGhostReservedOAMIndex(index)
   end
 
   if ghostOamStrategy == "dynamic" then
-    if not dynamicGhostOAMIndices then
-      return false
-    end
-    for slot = 1, #dynamicGhostOAMIndices do
-      if dynamicGhostOAMIndices[slot] == i then
-        return true
-      end
-    end
-    return false
+    return dynamicGhostOAMIndexSet ~= nil and dynamicGhostOAMIndexSet[i] == true
   end
 
   return i >= ghostOamBaseIndex and i < (ghostOamBaseIndex + ghostOamSlotCount)
@@ -301,6 +349,10 @@ local function toWRAMOffset(address)
   return address - 0x02000000
 end
 
+-- mGBA memory domain method per access size (1, 2, 4 bytes)
+local READ_METHOD = { [1] = "read8", [2] = "read16", [4] = "read32" }
+local WRITE_METHOD = { [1] = "write8", [2] = "write16", [4] = "write32" }
+
 --[[
   Safe memory read with error handling
   @param address Memory address to read from (absolute GBA address)
@@ -314,15 +366,12 @@ local function safeRead(address, size)
 
   local offset = toWRAMOffset(address)
 
-  local success, value = pcall(function()
-    if size == 1 then
-      return emu.memory.wram:read8(offset)
-    elseif size == 2 then
-      return emu.memory.wram:read16(offset)
-    elseif size == 4 then
-      return emu.memory.wram:read32(offset)
-    end
-  end)
+  local method = READ_METHOD[size]
+  if not method then
+    return nil
+  end
+  local domain = emu.memory.wram
+  local success, value = pcall(domain[method], domain, offset)
 
   if success then
     return value
@@ -363,15 +412,12 @@ local function safeReadIWRAM(address, size)
 
   local offset = toIWRAMOffset(address)
 
-  local success, value = pcall(function()
-    if size == 1 then
-      return emu.memory.iwram:read8(offset)
-    elseif size == 2 then
-      return emu.memory.iwram:read16(offset)
-    elseif size == 4 then
-      return emu.memory.iwram:read32(offset)
-    end
-  end)
+  local method = READ_METHOD[size]
+  if not method then
+    return nil
+  end
+  local domain = emu.memory.iwram
+  local success, value = pcall(domain[method], domain, offset)
 
   if success then
     return value
@@ -392,10 +438,8 @@ local function readCart8(address)
   if not isValidRomPointer(address) then
     return nil
   end
-  local offset = toCartOffset(address)
-  local ok, value = pcall(function()
-    return emu.memory.cart0:read8(offset)
-  end)
+  local cart0 = emu.memory.cart0
+  local ok, value = pcall(cart0.read8, cart0, toCartOffset(address))
   if ok then
     return value
   end
@@ -407,10 +451,8 @@ local function readCart16(address)
     return nil
   end
 
-  local offset = toCartOffset(address)
-  local ok16, value16 = pcall(function()
-    return emu.memory.cart0:read16(offset)
-  end)
+  local cart0 = emu.memory.cart0
+  local ok16, value16 = pcall(cart0.read16, cart0, toCartOffset(address))
   if ok16 and value16 then
     return value16
   end
@@ -428,10 +470,8 @@ local function readCart32(address)
     return nil
   end
 
-  local offset = toCartOffset(address)
-  local ok32, value32 = pcall(function()
-    return emu.memory.cart0:read32(offset)
-  end)
+  local cart0 = emu.memory.cart0
+  local ok32, value32 = pcall(cart0.read32, cart0, toCartOffset(address))
   if ok32 and value32 then
     return value32
   end
@@ -450,10 +490,8 @@ local function toSigned32(value)
   if value == nil then
     return nil
   end
-  if value >= 0x80000000 then
-    return value - 0x100000000
-  end
-  return value
+  -- Flip the sign bit and subtract it back: sign-extends without a branch
+  return (value ~ 0x80000000) - 0x80000000
 end
 
 --[[
@@ -516,17 +554,12 @@ function HAL.safeWrite(address, value, size)
 
   local offset = toWRAMOffset(address)
 
-  local success = pcall(function()
-    if size == 1 then
-      emu.memory.wram:write8(offset, value)
-    elseif size == 2 then
-      emu.memory.wram:write16(offset, value)
-    elseif size == 4 then
-      emu.memory.wram:write32(offset, value)
-    end
-  end)
-
-  return success
+  local method = WRITE_METHOD[size]
+  if not method then
+    return false
+  end
+  local domain = emu.memory.wram
+  return (pcall(domain[method], domain, offset, value))
 end
 
 --[[
@@ -543,14 +576,12 @@ end
 
 local function autoWrite(address, value, size)
   if address >= 0x03000000 and address < 0x03008000 then
-    local offset = toIWRAMOffset(address)
-    local ok = pcall(function()
-      if size == 1 then emu.memory.iwram:write8(offset, value)
-      elseif size == 2 then emu.memory.iwram:write16(offset, value)
-      elseif size == 4 then emu.memory.iwram:write32(offset, value)
-      end
-    end)
-    return ok
+    local method = WRITE_METHOD[size]
+    if not method then
+      return false
+    end
+    local domain = emu.memory.iwram
+    return (pcall(domain[method], domain, toIWRAMOffset(address), value))
   else
     return HAL.safeWrite(address, value, size)
   end
@@ -635,28 +666,82 @@ local function readMapLayoutSize(mapLayoutPtr)
   if not isValidRomPointer(mapLayoutPtr) then
     return nil, nil
   end
+  local cached = mapLayoutSizeCache[mapLayoutPtr]
+  if cached ~= nil then
+    if not cached then
+      return nil, nil
+    end
+    return cached[1], cached[2]
+  end
+
   local width = readCart32(mapLayoutPtr)
   local height = readCart32(mapLayoutPtr + 4)
   if not width or not height then
     return nil, nil
   end
   if width <= 0 or height <= 0 or width > 1024 or height > 1024 then
+    mapLayoutSizeCache[mapLayoutPtr] = false
     return nil, nil
   end
   local borderPtr = readCart32(mapLayoutPtr + 8)
   local mapPtr = readCart32(mapLayoutPtr + 0x0C)
+  if not borderPtr or not mapPtr then
+    return nil, nil
+  end
   if not isValidRomPointer(borderPtr) or not isValidRomPointer(mapPtr) then
+    mapLayoutSizeCache[mapLayoutPtr] = false
     return nil, nil
   end
+  mapLayoutSizeCache[mapLayoutPtr] = { width, height }
   return width, height
 end
 
-local function validateMapHeaderAt(address, x, y)
-  local mapLayoutPtr = safeRead(address, 4)
-  local eventsPtr = safeRead(address + 4, 4)
-  local connectionsPtr = safeRead(address + 0x0C, 4)
-  local mapLayoutId = safeRead(address + 0x12, 2)
-  local mapType = safeRead(address + 0x17, 1)
+--[[
+  Read the {count, tablePtr} header of a MapConnections struct in ROM, memoized
+  per pointer: header validation and scoring ask for it on every frame and for
+  every gMapHeader scan candidate.
+  @param connectionsPtr number ROM address of the MapConnections struct
+  @return number|nil count, number|nil tablePtr
+]]
+local function readConnectionsHeader(connectionsPtr)
+  local cached = mapConnectionsHeaderCache[connectionsPtr]
+  if cached then
+    return cached[1], cached[2]
+  end
+  local count = readCart32(connectionsPtr)
+  local tablePtr = readCart32(connectionsPtr + 4)
+  if count and tablePtr then
+    mapConnectionsHeaderCache[connectionsPtr] = { count, tablePtr }
+  end
+  return count, tablePtr
+end
+
+-- Bytes of MapHeader covering every field the validation/scoring reads
+local MAP_HEADER_READ_SIZE = 0x18
+
+--[[
+  Read the MapHeader fields used to validate and score a gMapHeader candidate:
+  one readRange for an aligned header, per-field reads otherwise.
+  @param address number Absolute EWRAM address of the candidate
+  @return mapLayoutPtr, eventsPtr, connectionsPtr, mapLayoutId, mapType (each may be nil)
+]]
+local function readMapHeaderFields(address)
+  local offset = address - 0x02000000
+  if address % 4 == 0 and offset >= WRAM_START and offset + MAP_HEADER_READ_SIZE <= WRAM_SIZE then
+    local wram = emu.memory.wram
+    local ok, data = pcall(wram.readRange, wram, offset, MAP_HEADER_READ_SIZE)
+    if ok and data and #data == MAP_HEADER_READ_SIZE then
+      -- +0x00 mapLayout, +0x04 events, +0x0C connections, +0x12 mapLayoutId, +0x17 mapType
+      local mapLayoutPtr, eventsPtr, connectionsPtr, mapLayoutId, mapType =
+        string.unpack("<I4I4xxxxI4xxI2xxxB", data)
+      return mapLayoutPtr, eventsPtr, connectionsPtr, mapLayoutId, mapType
+    end
+  end
+  return safeRead(address, 4), safeRead(address + 4, 4), safeRead(address + 0x0C, 4),
+    safeRead(address + 0x12, 2), safeRead(address + 0x17, 1)
+end
+
+local function validateMapHeaderFields(mapLayoutPtr, eventsPtr, connectionsPtr, mapLayoutId, mapType, x, y)
   if not mapLayoutPtr or not eventsPtr or not mapLayoutId then
     return false
   end
@@ -681,8 +766,7 @@ local function validateMapHeaderAt(address, x, y)
     if not isValidRomPointer(connectionsPtr) then
       return false
     end
-    local count = readCart32(connectionsPtr)
-    local tablePtr = readCart32(connectionsPtr + 4)
+    local count, tablePtr = readConnectionsHeader(connectionsPtr)
     if not count or count < 0 or count > 32 then
       return false
     end
@@ -694,23 +778,26 @@ local function validateMapHeaderAt(address, x, y)
   return true
 end
 
+local function validateMapHeaderAt(address, x, y)
+  local mapLayoutPtr, eventsPtr, connectionsPtr, mapLayoutId, mapType = readMapHeaderFields(address)
+  return validateMapHeaderFields(mapLayoutPtr, eventsPtr, connectionsPtr, mapLayoutId, mapType, x, y)
+end
+
 local function scoreMapHeaderAt(addr, currentX, currentY)
   if type(addr) ~= "number" then
     return -1
   end
-  if not validateMapHeaderAt(addr, currentX, currentY) then
+  local mapLayoutPtr, eventsPtr, connectionsPtr, mapLayoutId, mapType = readMapHeaderFields(addr)
+  if not validateMapHeaderFields(mapLayoutPtr, eventsPtr, connectionsPtr, mapLayoutId, mapType, currentX, currentY) then
     return -1
   end
 
-  local mapLayoutPtr = safeRead(addr, 4)
   local width, height = readMapLayoutSize(mapLayoutPtr)
   if not width or not height then
     return -1
   end
 
-  local connectionsPtr = safeRead(addr + 0x0C, 4)
-  local mapLayoutId = safeRead(addr + 0x12, 2) or 0
-  local mapType = safeRead(addr + 0x17, 1) or 0xFF
+  mapType = mapType or 0xFF
   local score = 0
 
   if mapLayoutId > 0 and mapLayoutId < 10000 then
@@ -727,8 +814,7 @@ local function scoreMapHeaderAt(addr, currentX, currentY)
   if connectionsPtr == 0 then
     score = score + 1
   elseif isValidRomPointer(connectionsPtr) then
-    local count = readCart32(connectionsPtr)
-    local tablePtr = readCart32(connectionsPtr + 4)
+    local count, tablePtr = readConnectionsHeader(connectionsPtr)
     if count and count >= 0 and count <= 32 and (count == 0 or isValidRomPointer(tablePtr)) then
       score = score + 2
     else
@@ -744,16 +830,54 @@ local function scoreMapHeaderAt(addr, currentX, currentY)
   return score
 end
 
+-- gMapHeader scan reads EWRAM in chunks of this size (mGBA's readRange limit)
+local MAP_HEADER_SCAN_CHUNK = 4096
+
+-- Lua pattern matching the top bytes of two consecutive words that are both ROM
+-- pointers (0x08/0x09 high byte = ROM_BASE..ROM_END), anchored on the first top byte
+local MAP_HEADER_PTRS_PATTERN = "[\8\9]...[\8\9]"
+
 local function findMapHeaderAddress(currentX, currentY)
   local bestAddr = nil
   local bestScore = -1
-
-  for offset = 0, WRAM_SIZE - 0x20, 4 do
-    local addr = 0x02000000 + offset
-    local score = scoreMapHeaderAt(addr, currentX, currentY)
-    if score > bestScore then
-      bestScore = score
-      bestAddr = addr
+  local wram = emu.memory.wram
+  local lastOffset = WRAM_SIZE - 0x20
+  -- Chunks overlap by 8 bytes so each candidate's first two words sit in one chunk
+  local step = MAP_HEADER_SCAN_CHUNK - 8
+
+  for base = 0, lastOffset, step do
+    local len = math.min(MAP_HEADER_SCAN_CHUNK, WRAM_SIZE - base)
+    local ok, data = pcall(wram.readRange, wram, base, len)
+    local lastInChunk = math.min(base + step - 4, lastOffset)
+    if ok and data and #data == len then
+      -- A header needs ROM mapLayout/events pointers at +0/+4 (scoreMapHeaderAt
+      -- returns -1 otherwise), so jump between aligned word pairs whose top bytes
+      -- are both ROM pointer bytes instead of unpacking every word.
+      local hit = string.find(data, MAP_HEADER_PTRS_PATTERN, 4)
+      while hit do
+        local offset = base + hit - 4
+        if offset > lastInChunk then
+          break
+        end
+        if (hit - 4) & 3 == 0 then
+          local addr = 0x02000000 + offset
+          local score = scoreMapHeaderAt(addr, currentX, currentY)
+          if score > bestScore then
+            bestScore = score
+            bestAddr = addr
+          end
+        end
+        hit = string.find(data, MAP_HEADER_PTRS_PATTERN, hit + 1)
+      end
+    else
+      for offset = base, lastInChunk, 4 do
+        local addr = 0x02000000 + offset
+        local score = scoreMapHeaderAt(addr, currentX, currentY)
+        if score > bestScore then
+          bestScore = score
+          bestAddr = addr
+        end
+      end
     end
   end
 
@@ -828,6 +952,70 @@ local function getMapHeaderAddress(currentX, currentY)
   return nil
 end
 
+-- Bytes per MapConnection entry (direction, pad, offset, mapGroup, mapId, pad)
+local MAP_CONNECTION_SIZE = 12
+
+--[[
+  Decode the MapConnections list at a ROM pointer, cached per pointer so the
+  per-frame projection read doesn't re-read the same ROM entries.
+  @param connectionsPtr number ROM address of the MapConnections struct
+  @return table Array of {direction, offset, mapGroup, mapId} (may be empty)
+]]
+local function readMapConnections(connectionsPtr)
+  local cached = mapConnectionsCache[connectionsPtr]
+  if cached then
+    return cached
+  end
+
+  local entries = {}
+  local complete = true
+  local count, tablePtr = readConnectionsHeader(connectionsPtr)
+  if count and count > 0 and count <= 32 and isValidRomPointer(tablePtr) then
+    -- Whole table in one readRange; per-field reads if that fails
+    local tableBytes = count * MAP_CONNECTION_SIZE
+    local data = nil
+    if isValidRomPointer(tablePtr + tableBytes - 1) then
+      local cart0 = emu.memory.cart0
+      local ok, bytes = pcall(cart0.readRange, cart0, toCartOffset(tablePtr), tableBytes)
+      if ok and bytes and #bytes == tableBytes then
+        data = bytes
+      end
+    end
+    for i = 0, count - 1 do
+      local direction, offset, mapGroup, mapId
+      if data then
+        -- +0x00 direction, +0x04 offset (s32), +0x08 mapGroup, +0x09 mapId
+        direction, offset, mapGroup, mapId =
+          string.unpack("<Bxxxi4BB", data, i * MAP_CONNECTION_SIZE + 1)
+      else
+        local base = tablePtr + i * MAP_CONNECTION_SIZE
+        direction = readCart8(base)
+        offset = toSigned32(readCart32(base + 4))
+        mapGroup = readCart8(base + 8)
+        mapId = readCart8(base + 9)
+      end
+      if not (direction and offset and mapGroup and mapId) then
+        complete = false
+      end
+
+      if direction and offset and mapGroup and mapId
+        and direction >= 1 and direction <= 4 then
+        entries[#entries + 1] = {
+          direction = direction,
+          offset = offset,
+          mapGroup = mapGroup,
+          mapId = mapId,
+        }
+      end
+    end
+  end
+  -- Failed reads aren't cached (retry next frame)
+  if count and complete then
+    mapConnectionsCache[connectionsPtr] = entries
+  end
+  return entries
+end
+
 --[[
   Read deterministic map projection metadata used for cross-map ghost rendering.
   Returns map width/height (borderX/borderY) and the active map connection list.
@@ -838,36 +1026,24 @@ function HAL.readMapProjectionMeta(currentX, currentY)
     return nil
   end
 
-  local mapLayoutPtr = safeRead(headerAddr, 4)
+  local mapLayoutPtr, _, connectionsPtr = readMapHeaderFields(headerAddr)
   local width, height = readMapLayoutSize(mapLayoutPtr)
   if not width or not height then
     return nil
   end
 
   local connections = {}
-  local connectionsPtr = safeRead(headerAddr + 0x0C, 4)
   if connectionsPtr and connectionsPtr ~= 0 and isValidRomPointer(connectionsPtr) then
-    local count = readCart32(connectionsPtr) or 0
-    local tablePtr = readCart32(connectionsPtr + 4)
-    if count > 0 and count <= 32 and isValidRomPointer(tablePtr) then
-      for i = 0, count - 1 do
-        local base = tablePtr + i * 12
-        local direction = readCart8(base)
-        local offsetRaw = readCart32(base + 4)
-        local mapGroup = readCart8(base + 8)
-        local mapId = readCart8(base + 9)
-        local offset = toSigned32(offsetRaw)
-
-        if direction and offset and mapGroup and mapId
-          and direction >= 1 and direction <= 4 then
-          connections[#connections + 1] = {
-            direction = direction,
-            offset = offset,
-            mapGroup = mapGroup,
-            mapId = mapId,
-          }
-        end
-      end
+    local entries = readMapConnections(connectionsPtr)
+    for i = 1, #entries do
+      local entry = entries[i]
+      -- Fresh tables per call: callers keep and forward the connection list
+      connections[i] = {
+        direction = entry.direction,
+        offset = entry.offset,
+        mapGroup = entry.mapGroup,
+        mapId = entry.mapId,
+      }
     end
   end
 
@@ -916,10 +1092,10 @@ end
   Camera offsets (gSpriteCoordOffsetX/Y) are s16 but read16 returns u16
 ]]
 local function toSigned16(value)
-  if value and value >= 0x8000 then
-    return value - 0x10000
+  if value == nil then
+    return nil
   end
-  return value
+  return (value ~ 0x8000) - 0x8000
 end
 
 function HAL.readCameraX()
@@ -998,6 +1174,14 @@ end
 -- Functions referencing this EWRAM address include ApplyCurrentWarp.
 -- WarpIntoMap calls ApplyCurrentWarp as its first BL (3 BL calls total).
 
+-- Default sWarpDestination anchor; config.warp.sWarpDataAddr overrides it
+local DEFAULT_SWARP_DEST_ADDR = 0x020318A8
+
+-- sWarpDestination address the ROM scan anchors on for the loaded config
+local function warpScanAnchor()
+  return config.warp.sWarpDataAddr or DEFAULT_SWARP_DEST_ADDR
+end
+
 -- Cache for sWarpData EWRAM offset (found via runtime scan)
 local sWarpDataOffset = nil
 
@@ -1016,6 +1200,43 @@ local TRAMPOLINE_EWRAM = 0x0203FF00
 -- ROM scratch area for trampoline (found at runtime — cart0 writes confirmed working)
 local romScratchOffset = nil  -- cart0 offset (not absolute)
 
+-- EWRAM pattern scans read this many bytes per readRange call (mGBA's limit)
+local WRAM_SCAN_CHUNK = 4096
+
+--[[
+  Find 4-byte-aligned occurrences of a byte pattern in EWRAM, in ascending order.
+  Streams the range through readRange in chunks that overlap by the pattern
+  length and locates hits with a plain string.find, instead of one pcall'd
+  read32 per word.
+  @param needle string Byte pattern to find
+  @param firstOffset number First candidate WRAM offset
+  @param lastOffset number Last candidate WRAM offset (needle must fit after it)
+  @param onHit function(offset) Called per aligned hit; a truthy return stops the scan
+  @return any The first truthy onHit result, or nil
+]]
+local function scanWRAMAligned(needle, firstOffset, lastOffset, onHit)
+  local wram = emu.memory.wram
+  local step = (WRAM_SCAN_CHUNK - #needle) & ~3
+  for base = firstOffset, lastOffset, step do
+    local len = math.min(WRAM_SCAN_CHUNK, lastOffset + #needle - base)
+    local ok, data = pcall(wram.readRange, wram, base, len)
+    if ok and data then
+      -- Hits starting at or past 'step' are picked up by the next chunk
+      local limit = math.min(step, lastOffset - base + 1)
+      local pos = string.find(data, needle, 1, true)
+      while pos and pos <= limit do
+        local offset = base + pos - 1
+        if offset & 3 == 0 then
+          local result = onHit(offset)
+          if result then return result end
+        end
+        pos = string.find(data, needle, pos + 1, true)
+      end
+    end
+  end
+  return nil
+end
+
 --[[
   Scan EWRAM to find sWarpData address.
   sWarpData is the game's internal warp destination struct. CB2_LoadMap reads
@@ -1056,37 +1277,30 @@ function HAL.findSWarpData()
 
   console:log("[HAL] findSWarpData: cluster scan for sDummyWarpData pair (full EWRAM)...")
 
-  for offset = 8, 0x3FFF0, 4 do  -- start at 8 so sWarpDestination (offset-8) >= 0
-    local ok1, v1 = pcall(emu.memory.wram.read32, emu.memory.wram, offset)
-    if ok1 and v1 == DUMMY_LO then
-      local ok2, v2 = pcall(emu.memory.wram.read32, emu.memory.wram, offset + 4)
-      if ok2 and v2 == DUMMY_HI then
-        -- Found one sDummyWarpData at 'offset'. Check if next 8 bytes also match.
-        local ok3, v3 = pcall(emu.memory.wram.read32, emu.memory.wram, offset + 8)
-        local ok4, v4 = pcall(emu.memory.wram.read32, emu.memory.wram, offset + 12)
-        if ok3 and ok4 and v3 == DUMMY_LO and v4 == DUMMY_HI then
-          -- Two consecutive sDummyWarpData found!
-          -- sFixedDiveWarp = offset, sFixedHoleWarp = offset + 8
-          -- sWarpDestination = offset - 8
-          local candidateOffset = offset - 8
-          -- Sanity check: verify sWarpDestination looks like a WarpData
-          -- (mapGroup and mapId should be within valid ranges, or zeroed)
-          local okA, warpLo = pcall(emu.memory.wram.read32, emu.memory.wram, candidateOffset)
-          if okA then
-            local mg = warpLo & 0xFF
-            local mi = (warpLo >> 8) & 0xFF
-            -- Accept if mapGroup/mapId are valid OR zeroed (game hasn't set it yet)
-            if mg <= 50 or mg == 0xFF or warpLo == 0 then
-              sWarpDataOffset = candidateOffset
-              console:log(string.format("[HAL] sWarpData FOUND via cluster scan at 0x%08X (mapGroup=%d mapId=%d)",
-                0x02000000 + candidateOffset, mg, mi))
-              return true
-            end
-          end
-        end
+  -- Two consecutive sDummyWarpData entries (sFixedDiveWarp + sFixedHoleWarp)
+  local dummyPair = string.pack("<I4I4I4I4", DUMMY_LO, DUMMY_HI, DUMMY_LO, DUMMY_HI)
+
+  -- start at 8 so sWarpDestination (offset-8) >= 0
+  local found = scanWRAMAligned(dummyPair, 8, 0x3FFF0, function(offset)
+    -- sFixedDiveWarp = offset, sFixedHoleWarp = offset + 8
+    -- sWarpDestination = offset - 8
+    local candidateOffset = offset - 8
+    -- Sanity check: verify sWarpDestination looks like a WarpData
+    -- (mapGroup and mapId should be within valid ranges, or zeroed)
+    local okA, warpLo = pcall(emu.memory.wram.read32, emu.memory.wram, candidateOffset)
+    if okA then
+      local mg = warpLo & 0xFF
+      local mi = (warpLo >> 8) & 0xFF
+      -- Accept if mapGroup/mapId are valid OR zeroed (game hasn't set it yet)
+      if mg <= 50 or mg == 0xFF or warpLo == 0 then
+        sWarpDataOffset = candidateOffset
+        console:log(string.format("[HAL] sWarpData FOUND via cluster scan at 0x%08X (mapGroup=%d mapId=%d)",
+          0x02000000 + candidateOffset, mg, mi))
+        return true
       end
     end
-  end
+  end)
+  if found then return true end
 
   console:log("[HAL] findSWarpData: cluster scan found no sDummyWarpData pair")
 
@@ -1109,56 +1323,362 @@ function HAL.findSWarpData()
     mg, mi, ref32a, ref32b))
 
   -- Scan all EWRAM, skip the SaveBlock1->location itself (at locOffset)
-  for offset = 0, 0x3FFF8, 4 do
-    if offset ~= locOffset then
-      local s1, val = pcall(emu.memory.wram.read32, emu.memory.wram, offset)
-      if s1 and val == ref32a then
-        local s2, val2 = pcall(emu.memory.wram.read32, emu.memory.wram, offset + 4)
-        if s2 and val2 == ref32b then
-          -- Verify neighbor: check if +8 or +16 has sDummyWarpData pattern
-          local okN, nv = pcall(emu.memory.wram.read32, emu.memory.wram, offset + 8)
-          if okN and nv == DUMMY_LO then
-            sWarpDataOffset = offset
-            console:log(string.format("[HAL] sWarpData FOUND via pattern+neighbor at 0x%08X",
-              0x02000000 + offset))
-            return true
-          end
-          -- Accept even without neighbor verification if in low EWRAM (< SaveBlock1)
-          if offset < locOffset then
-            sWarpDataOffset = offset
-            console:log(string.format("[HAL] sWarpData FOUND via pattern match at 0x%08X (low EWRAM)",
-              0x02000000 + offset))
-            return true
+  local locationPattern = string.pack("<I4I4", ref32a, ref32b)
+  found = scanWRAMAligned(locationPattern, 0, 0x3FFF8, function(offset)
+    if offset == locOffset then return nil end
+    -- Verify neighbor: check if +8 or +16 has sDummyWarpData pattern
+    local okN, nv = pcall(emu.memory.wram.read32, emu.memory.wram, offset + 8)
+    if okN and nv == DUMMY_LO then
+      sWarpDataOffset = offset
+      console:log(string.format("[HAL] sWarpData FOUND via pattern+neighbor at 0x%08X",
+        0x02000000 + offset))
+      return true
+    end
+    -- Accept even without neighbor verification if in low EWRAM (< SaveBlock1)
+    if offset < locOffset then
+      sWarpDataOffset = offset
+      console:log(string.format("[HAL] sWarpData FOUND via pattern match at 0x%08X (low EWRAM)",
+        0x02000000 + offset))
+      return true
+    end
+  end)
+  if found then return true end
+
+  console:log("[HAL] findSWarpData: no match found in full EWRAM scan")
+  return false
+end
+
+-- ROM literal-pool scan: region size and mGBA readRange chunk size
+local ROM_SCAN_SIZE = 0x800000  -- 8MB (code + literal pools live below this)
+local ROM_READ_CHUNK = 4096     -- mGBA readRange has undocumented size limit
+-- Local aliases: the scan loops decode millions of words, skip the global+field lookup
+local strbyte = string.byte
+local strfind = string.find
+local strunpack = string.unpack
+
+--[[
+  End of the ROM scan region (cart0 offset): ROM_SCAN_SIZE, clamped to the loaded
+  cartridge size so smaller ROMs don't scan mirrored/open-bus space past their end.
+  @return number
+]]
+local function romScanEnd()
+  local ok, size = pcall(emu.memory.cart0.size, emu.memory.cart0)
+  if ok and type(size) == "number" and size > 0 and size < ROM_SCAN_SIZE then
+    return size - (size % ROM_READ_CHUNK)
+  end
+  return ROM_SCAN_SIZE
+end
+
+-- cart0 chunks keyed by chunk base, shared by all scan phases (nil outside a scan)
+local romChunkCache = nil
+
+--[[
+  Read one ROM_READ_CHUNK-aligned chunk of cart0. During a warp scan every phase
+  reads through this, so overlapping windows hit the ROM only once.
+
+  @param base number Chunk-aligned cart0 offset
+  @return string|nil Chunk bytes, or nil on read failure
+]]
+local function readROMChunk(base)
+  local cache = romChunkCache
+  local data = cache and cache[base]
+  if data then return data end
+  local ok, result = pcall(emu.memory.cart0.readRange, emu.memory.cart0, base, ROM_READ_CHUNK)
+  if not ok or not result then return nil end
+  if cache then cache[base] = result end
+  return result
+end
+
+--[[
+  Read an arbitrary cart0 range via the shared chunk cache (no readRange size limit).
+
+  @param offset number cart0 offset
+  @param length number Bytes to read
+  @return string|nil Range bytes, or nil on read failure
+]]
+local function readROMRange(offset, length)
+  if length <= 0 then return nil end
+  local first = offset - (offset % ROM_READ_CHUNK)
+  local start = offset - first + 1
+  if start + length - 1 <= ROM_READ_CHUNK then
+    -- Range inside one chunk: slice it directly, no parts table or concat copy
+    local data = readROMChunk(first)
+    if data then
+      return string.sub(data, start, start + length - 1)
+    end
+  end
+  local parts = {}
+  for base = first, offset + length - 1, ROM_READ_CHUNK do
+    local data = readROMChunk(base)
+    if not data then
+      -- Chunk past the end of the cartridge: fall back to an exact-size read
+      if length > ROM_READ_CHUNK then return nil end
+      local ok, direct = pcall(emu.memory.cart0.readRange, emu.memory.cart0, offset, length)
+      return ok and direct or nil
+    end
+    parts[#parts + 1] = data
+  end
+  return string.sub(table.concat(parts), start, start + length - 1)
+end
+
+--[[
+  Find 4-byte-aligned ROM literal pool entries for several 32-bit values at once.
+  All requested values are matched in a single pass over the scan region (one
+  readRange per chunk instead of one full pass per value), and results are cached
+  so later phases asking for an already-scanned value don't touch the ROM again.
+
+  @param values table Array of u32 values to look up
+  @return table Map value -> array of cart0 offsets (ascending)
+]]
+local function findROMLiteralRefs(values)
+  local wanted = {}
+  local needles = {}
+  for _, v in ipairs(values) do
+    if not romLiteralRefs[v] and not wanted[v] then
+      wanted[v] = {}
+      needles[#needles + 1] = { bytes = string.pack("<I4", v), refs = wanted[v] }
+    end
+  end
+
+  if #needles > 0 then
+    -- Stream the region: chunks are not added to romChunkCache, so the full pass
+    -- doesn't pin ~8MB of strings for the rest of the scan (later phases only
+    -- touch a few windows and cache those).
+    -- Each needle is located with a plain string.find (C memchr/memcmp) instead of
+    -- decoding every word in Lua; only 4-byte-aligned hits are literal pool entries.
+    -- Aligned words never straddle a chunk boundary, so per-chunk search is exact.
+    local cart0 = emu.memory.cart0
+    local complete = true
+    for base = 0, romScanEnd() - ROM_READ_CHUNK, ROM_READ_CHUNK do
+      local ok, data = pcall(cart0.readRange, cart0, base, ROM_READ_CHUNK)
+      if not ok or not data then
+        complete = false
+      else
+        for n = 1, #needles do
+          local needle = needles[n]
+          local refs = needle.refs
+          local pos = strfind(data, needle.bytes, 1, true)
+          while pos do
+            if (pos - 1) & 3 == 0 then
+              refs[#refs + 1] = base + pos - 1
+            end
+            pos = strfind(data, needle.bytes, pos + 1, true)
           end
         end
       end
     end
+    -- A pass with failed chunk reads may have missed refs: use it, don't cache it
+    if complete then
+      for v, refs in pairs(wanted) do
+        romLiteralRefs[v] = refs
+      end
+    end
   end
 
-  console:log("[HAL] findSWarpData: no match found in full EWRAM scan")
-  return false
+  local result = {}
+  for _, v in ipairs(values) do
+    result[v] = romLiteralRefs[v] or wanted[v]
+  end
+  return result
 end
 
--- Helper: read u16 little-endian from binary string at 1-indexed position
-local function strU16(s, pos)
-  local b0, b1 = string.byte(s, pos, pos + 1)
-  if not b0 or not b1 then return nil end
-  return b0 + b1 * 256
+-- string.unpack format for a THUMB BL pair (two little-endian halfwords)
+local BL_PAIR_FMT = "<I2I2"
+
+-- Log lines buffered during a warp scan (nil outside a scan), flushed in one console:log
+local scanLogLines = nil
+
+local function scanLog(msg)
+  if scanLogLines then
+    scanLogLines[#scanLogLines + 1] = msg
+  else
+    console:log(msg)
+  end
+end
+
+--[[
+  Log a WarpIntoMap candidate list (with BL targets) as one block
+  instead of one call per line; the console redraws on every log call.
+  @param label string Line prefix ("Candidate", "P3b Candidate")
+  @param candidates table Array of {addr, size, blCount, blTargets}
+]]
+local function logWarpCandidates(label, candidates)
+  local lines = {}
+  for ci, c in ipairs(candidates) do
+    lines[#lines + 1] = string.format("[HAL]   %s %d: 0x%08X (%d bytes, %d BLs)", label, ci, c.addr, c.size, c.blCount)
+    for j, t in ipairs(c.blTargets) do
+      lines[#lines + 1] = string.format("[HAL]     BL%d -> 0x%08X", j, t)
+    end
+  end
+  if #lines > 0 then
+    scanLog(table.concat(lines, "\n"))
+  end
+end
+
+-- THUMB opcode classes, looked up by the high byte of a halfword
+local OP_PUSH = 1     -- PUSH {..}       0xB4xx / 0xB5xx
+local OP_BL_HI = 2    -- BL prefix       0xF0xx-0xF7xx
+local OP_BL_LO = 3    -- BL suffix       0xF8xx-0xFFxx
+local THUMB_OP_CLASS = {}
+for hi = 0, 255 do
+  local cls = false
+  if hi == 0xB4 or hi == 0xB5 then cls = OP_PUSH
+  elseif hi >= 0xF0 and hi <= 0xF7 then cls = OP_BL_HI
+  elseif hi >= 0xF8 then cls = OP_BL_LO
+  end
+  THUMB_OP_CLASS[hi] = cls
+end
+
+-- Lua pattern matching a PUSH high byte (0xB4 / 0xB5), for string.find prefilters
+local PUSH_HI_PATTERN = "[\180\181]"
+
+-- Lua pattern matching a BL pair from the prefix's high byte: 0xF0-0xF7, any, 0xF8-0xFF
+local BL_PAIR_PATTERN = "[\240-\247].[\248-\255]"
+
+-- Lua pattern matching an LDR Rd, [PC, #imm] high byte (0x48-0x4F)
+local LDR_PC_HI_PATTERN = "[\72-\79]"
+
+-- Lua pattern matching a function-end high byte: POP {.., PC} (0xBD) or BX (0x47)
+local FUNC_END_HI_PATTERN = "[\189\71]"
+
+--[[
+  Find the last PUSH halfword in a buffer, jumping between 0xB4/0xB5 bytes with
+  string.find instead of testing every halfword in Lua.
+  @param data string Buffer (position 1 must be halfword-aligned)
+  @param maxPos number Last 1-based halfword position to consider
+  @return number|nil 1-based position of the PUSH, or nil
+]]
+local function findLastPush(data, maxPos)
+  local last = nil
+  local hit = strfind(data, PUSH_HI_PATTERN, 2)
+  while hit and hit - 1 <= maxPos do
+    if hit % 2 == 0 then last = hit - 1 end
+    hit = strfind(data, PUSH_HI_PATTERN, hit + 1)
+  end
+  return last
 end
 
 -- Helper: decode THUMB BL target from two halfwords + PC address
 local function decodeBL(instrH, instrL, pc)
   local off11hi = instrH & 0x07FF
   local off11lo = instrL & 0x07FF
-  local fullOff = (off11hi << 12) | (off11lo << 1)
-  if fullOff >= 0x400000 then fullOff = fullOff - 0x800000 end
+  -- 23-bit signed offset, sign-extended branchlessly (flip bit 22, subtract it)
+  local fullOff = (((off11hi << 12) | (off11lo << 1)) ~ 0x400000) - 0x400000
   return pc + fullOff
 end
 
+-- analyzeThumbFunction results keyed by cart0 offset of the PUSH (nil outside a scan)
+local thumbFunctionCache = nil
+
+--[[
+  Decode a THUMB function starting at a PUSH: find its end (POP {PC} or BX LR
+  within 128 bytes) and collect BL targets as numbers, so callers compare
+  integers instead of re-decoding.
+
+  @param data string Buffer holding the function
+  @param funcStart number 1-based position of the PUSH in data
+  @param dataBase number cart0 offset of data's first byte
+  @return table|nil {addr (THUMB), size, blCount, blTargets}, or nil if no end found
+]]
+local function analyzeThumbFunction(data, funcStart, dataBase)
+  -- Overlapping Phase 3 windows and Phase 3b revisit the same prologues: reuse
+  -- decodes from earlier in this scan (false = known "no end within 128 bytes").
+  local romOff = dataBase + funcStart - 1
+  local cache = thumbFunctionCache
+  if cache then
+    local hit = cache[romOff]
+    if hit ~= nil then return hit or nil end
+  end
+
+  local searchEnd = funcStart + 128
+  local truncated = searchEnd > #data - 1
+  local funcEnd = nil
+  local lastJ = truncated and (#data - 1) or searchEnd
+  -- Jump between POP/BX high bytes; hits off the halfword grid are skipped
+  local hit = strfind(data, FUNC_END_HI_PATTERN, funcStart + 3)
+  while hit and hit - 1 <= lastJ do
+    local j = hit - 1
+    if (j - funcStart) & 1 == 0 and (strbyte(data, hit) == 0xBD or strbyte(data, j) == 0x70) then
+      funcEnd = j + 2
+      break
+    end
+    hit = strfind(data, FUNC_END_HI_PATTERN, hit + 1)
+  end
+  if not funcEnd then
+    -- Only a full 128-byte search is conclusive; a buffer edge may have cut it short
+    if cache and not truncated then cache[romOff] = false end
+    return nil
+  end
+
+  -- Jump between BL pairs with string.find; hits off the halfword grid are skipped
+  local blTargets = {}
+  local romPCBase = ROM_BASE + dataBase + 3  -- PC of the halfword at pos k is romPCBase + k
+  local k = funcStart
+  local lastPair = funcEnd - 4
+  while k <= lastPair do
+    local hit = strfind(data, BL_PAIR_PATTERN, k + 1)
+    if not hit or hit - 1 > lastPair then break end
+    k = hit - 1
+    if (k - funcStart) & 1 == 0 then
+      local h, l = strunpack(BL_PAIR_FMT, data, k)
+      blTargets[#blTargets + 1] = decodeBL(h, l, romPCBase + k)
+      k = k + 4
+    else
+      k = k + 1
+    end
+  end
+
+  local fn = {
+    addr = ROM_BASE + romOff + 1,
+    size = funcEnd - funcStart,
+    blCount = #blTargets,
+    blTargets = blTargets,
+  }
+  if cache then cache[romOff] = fn end
+  return fn
+end
+
+-- True if any BL of fn targets an address in targets (keyed by both THUMB-bit forms).
+-- The answer is kept on fn: Phase 3 and 3b ask about the same memoized decodes
+-- with the same target set.
+local function callsAnyTarget(fn, targets)
+  if fn.checkedTargets == targets then return fn.callsTarget end
+  local calls = false
+  for _, t in ipairs(fn.blTargets) do
+    if targets[t] then
+      calls = true
+      break
+    end
+  end
+  fn.checkedTargets = targets
+  fn.callsTarget = calls
+  return calls
+end
+
+-- Scan result cache key pending for the scan in progress (set once the scan really runs)
+local pendingScanFingerprint = nil
+
+-- Bump when scanner logic changes so results cached by an older scanner are rescanned
+local WARP_SCAN_VERSION = 2
+
+--[[
+  Identify the loaded ROM + warp config for the cross-reload scan cache
+  (_G.__pokecoopWarpScanCache): scanner version, cartFingerprint() and the
+  configured CB2_LoadMap and scan anchor.
+  @return string|nil Fingerprint, or nil if the header can't be read
+]]
+local function warpScanFingerprint()
+  local cart = cartFingerprint()
+  if not cart then return nil end
+  return string.format("v%d|%s|%s|%s", WARP_SCAN_VERSION, cart,
+    tostring(config.warp.cb2LoadMap), tostring(warpScanAnchor()))
+end
+
 --[[
   Multi-phase ROM scanner to find WarpIntoMap's address.
 
-  Phase 1: Search ROM for sWarpDestination (0x020318A8) in literal pools
+  Phase 1: Search ROM for sWarpDestination (0x020318A8, or config.warp.sWarpDataAddr)
+           in literal pools
            — much more targeted than CB2_LoadMap (3-10 refs vs 280)
   Phase 2: Identify functions referencing sWarpDestination
            — these are ApplyCurrentWarp, SetWarpDestination, etc.
@@ -1169,7 +1689,7 @@ end
 
   @return boolean True if WarpIntoMap was found (or manual override exists)
 ]]
-function HAL.scanROMForWarpFunction()
+local function scanROMForWarp()
   if romScanned then return warpIntoMapAddr ~= nil or warpFuncAddr ~= nil end
   romScanned = true
 
@@ -1178,78 +1698,75 @@ function HAL.scanROMForWarpFunction()
   -- Check manual overrides
   if config.warp.warpIntoMapAddr then
     warpIntoMapAddr = config.warp.warpIntoMapAddr
-    console:log(string.format("[HAL] WarpIntoMap from config: 0x%08X", warpIntoMapAddr))
+    scanLog(string.format("[HAL] WarpIntoMap from config: 0x%08X", warpIntoMapAddr))
     return true
   end
   if config.warp.setCB2WarpAddr then
     warpFuncAddr = config.warp.setCB2WarpAddr
-    console:log(string.format("[HAL] SetCB2WarpAndLoadMap from config: 0x%08X", warpFuncAddr))
+    scanLog(string.format("[HAL] SetCB2WarpAndLoadMap from config: 0x%08X", warpFuncAddr))
+    return true
+  end
+
+  -- Same ROM already scanned successfully before a script reload: reuse the result
+  local fingerprint = warpScanFingerprint()
+  local cached = _G.__pokecoopWarpScanCache
+  if fingerprint and cached and cached.fingerprint == fingerprint then
+    warpIntoMapAddr = cached.warpIntoMapAddr
+    loadCurrentMapDataAddr = cached.loadCurrentMapDataAddr
+    scanLog(string.format("[HAL] Warp scan cached for this ROM: WarpIntoMap=0x%08X LoadCurrentMapData=0x%08X",
+      warpIntoMapAddr or 0, loadCurrentMapDataAddr or 0))
     return true
   end
+  pendingScanFingerprint = fingerprint
 
-  console:log("[HAL] Scanning ROM for WarpIntoMap (EWRAM trampoline approach)...")
+  scanLog("[HAL] Scanning ROM for WarpIntoMap (EWRAM trampoline approach)...")
 
   -- ===== PHASE 1: Find sWarpDestination in ROM literal pools =====
-  local SWARP = 0x020318A8
-  local SW_B0, SW_B1, SW_B2, SW_B3 = 0xA8, 0x18, 0x03, 0x02
-  local SCAN_SIZE = 0x800000  -- 8MB
-  local CHUNK = 4096
-  local swarpRefs = {}
-
-  for base = 0, SCAN_SIZE - CHUNK, CHUNK do
-    local ok, data = pcall(emu.memory.cart0.readRange, emu.memory.cart0, base, CHUNK)
-    if ok and data then
-      for i = 1, #data - 3, 4 do
-        local b0, b1, b2, b3 = string.byte(data, i, i + 3)
-        if b0 == SW_B0 and b1 == SW_B1 and b2 == SW_B2 and b3 == SW_B3 then
-          table.insert(swarpRefs, base + i - 1)
-        end
-      end
-    end
+  -- CB2_LoadMap refs are collected in the same pass (used by Phase 3b and the fallback).
+  local SWARP = warpScanAnchor()
+  local SCAN_SIZE = romScanEnd()
+  local literals = { SWARP }
+  if config.warp.cb2LoadMap then
+    literals[#literals + 1] = config.warp.cb2LoadMap
   end
+  local swarpRefs = findROMLiteralRefs(literals)[SWARP]
 
-  console:log(string.format("[HAL] Phase 1: %d ROM refs to sWarpDestination (0x%08X)", #swarpRefs, SWARP))
+  scanLog(string.format("[HAL] Phase 1: %d ROM refs to sWarpDestination (0x%08X)", #swarpRefs, SWARP))
 
   if #swarpRefs == 0 then
-    console:log("[HAL] No sWarpDestination refs — trying CB2_LoadMap fallback...")
+    scanLog("[HAL] No sWarpDestination refs — trying CB2_LoadMap fallback...")
     return HAL.findWarpViaCallback()
   end
 
   -- ===== PHASE 2: Find containing functions =====
   local swarpFuncs = {}
+  local swarpFuncSet = {}  -- funcAddr -> true, for O(1) membership tests
 
   for _, litOff in ipairs(swarpRefs) do
     local searchStart = math.max(0, litOff - 256)
     local readLen = litOff - searchStart
     if readLen >= 2 then
-      local ok, data = pcall(emu.memory.cart0.readRange, emu.memory.cart0, searchStart, readLen)
-      if ok and data then
-        for back = 2, readLen, 2 do
-          local pos = readLen - back + 1
-          if pos >= 1 and pos + 1 <= #data then
-            local instr = strU16(data, pos)
-            if instr and ((instr & 0xFF00) == 0xB400 or (instr & 0xFF00) == 0xB500) then
-              local funcRomOff = searchStart + pos - 1
-              local funcAddr = 0x08000000 + funcRomOff + 1
-              local dup = false
-              for _, f in ipairs(swarpFuncs) do
-                if f.addr == funcAddr then dup = true; break end
-              end
-              if not dup then
-                table.insert(swarpFuncs, { addr = funcAddr, romOff = funcRomOff })
-              end
-              break
-            end
+      local data = readROMRange(searchStart, readLen)
+      -- Full-length read: every halfword walked below is in bounds, no per-step check
+      if data and #data == readLen then
+        local pos = findLastPush(data, readLen - 1)
+        if pos then
+          local funcRomOff = searchStart + pos - 1
+          local funcAddr = ROM_BASE + funcRomOff + 1
+          if not swarpFuncSet[funcAddr] then
+            swarpFuncSet[funcAddr] = true
+            table.insert(swarpFuncs, { addr = funcAddr, romOff = funcRomOff })
           end
         end
       end
     end
   end
 
-  console:log(string.format("[HAL] Phase 2: %d functions reference sWarpDestination", #swarpFuncs))
+  local p2Lines = { string.format("[HAL] Phase 2: %d functions reference sWarpDestination", #swarpFuncs) }
   for _, f in ipairs(swarpFuncs) do
-    console:log(string.format("[HAL]   0x%08X", f.addr))
+    p2Lines[#p2Lines + 1] = string.format("[HAL]   0x%08X", f.addr)
   end
+  scanLog(table.concat(p2Lines, "\n"))
 
   if #swarpFuncs == 0 then
     return HAL.findWarpViaCallback()
@@ -1257,16 +1774,22 @@ function HAL.scanROMForWarpFunction()
 
   -- ===== PHASE 3: Search nearby ROM for WarpIntoMap =====
   -- WarpIntoMap: 2-5 BL calls (compiler may tail-call), one targets a swarpFunc, 12-128 bytes
+  -- Keyed by both the THUMB-bit-cleared and -set address, so a BL target of
+  -- either form matches with one unmasked lookup
   local targets = {}
   for _, f in ipairs(swarpFuncs) do
     targets[f.addr & 0xFFFFFFFE] = true
-    targets[f.addr] = true
+    targets[f.addr | 1] = true
   end
 
   local WINDOW = 0x8000  -- ±32KB
   local candidates = {}
+  local candidateSet = {}  -- funcAddr -> true (windows may overlap)
   local scannedRanges = {}
 
+  -- Pick windows as before (one per WINDOW-aligned start), then merge overlapping
+  -- or touching ones so each ROM byte is walked once.
+  local windows = {}
   for _, sf in ipairs(swarpFuncs) do
     local rangeStart = math.max(0, sf.romOff - WINDOW)
     local rangeEnd = math.min(SCAN_SIZE, sf.romOff + WINDOW)
@@ -1274,98 +1797,75 @@ function HAL.scanROMForWarpFunction()
 
     if not scannedRanges[rangeKey] then
       scannedRanges[rangeKey] = true
-      local readLen = rangeEnd - rangeStart
-      -- Read in 4096-byte chunks (mGBA readRange has undocumented size limit)
-      local chunks = {}
-      for chunkBase = rangeStart, rangeStart + readLen - 1, CHUNK do
-        local chunkLen = math.min(CHUNK, rangeStart + readLen - chunkBase)
-        local cOk, cData = pcall(emu.memory.cart0.readRange, emu.memory.cart0, chunkBase, chunkLen)
-        if cOk and cData then
-          table.insert(chunks, cData)
+      windows[#windows + 1] = { rangeStart, rangeEnd }
+    end
+  end
+  table.sort(windows, function(a, b) return a[1] < b[1] end)
+  local mergedWindows = {}
+  for _, w in ipairs(windows) do
+    local last = mergedWindows[#mergedWindows]
+    if last and w[1] <= last[2] then
+      if w[2] > last[2] then last[2] = w[2] end
+    else
+      mergedWindows[#mergedWindows + 1] = { w[1], w[2] }
+    end
+  end
+
+  for _, w in ipairs(mergedWindows) do
+    local rangeStart, rangeEnd = w[1], w[2]
+    local data = readROMRange(rangeStart, rangeEnd - rangeStart) or ""
+    local dataLen = #data
+    if dataLen > 0 then
+      -- First pass: positions of every halfword-aligned BL pair in the window
+      -- that calls a Phase 2 function. A prologue with none of these within
+      -- its 128-byte reach can't qualify, so it is never decoded.
+      local callSites = {}
+      local romPCBase = ROM_BASE + rangeStart + 3
+      local blHit = strfind(data, BL_PAIR_PATTERN, 2)
+      while blHit do
+        if blHit % 2 == 0 then
+          local k = blHit - 1
+          local h, l = strunpack(BL_PAIR_FMT, data, k)
+          if targets[decodeBL(h, l, romPCBase + k)] then
+            callSites[#callSites + 1] = k
+          end
         end
+        blHit = strfind(data, BL_PAIR_PATTERN, blHit + 1)
       end
-      local data = table.concat(chunks)
-      if #data > 0 then
-        local i = 1
-        while i <= #data - 3 do
-          local instr = strU16(data, i)
-          if instr and ((instr & 0xFF00) == 0xB400 or (instr & 0xFF00) == 0xB500) then
-            local funcStart = i
-            -- Find function end (POP {PC} or BX LR, max 128 bytes)
-            local funcEnd = nil
-            local j = funcStart + 2
-            while j <= math.min(funcStart + 128, #data - 1) do
-              local instr2 = strU16(data, j)
-              if instr2 then
-                if (instr2 & 0xFF00) == 0xBD00 or instr2 == 0x4770 then
-                  funcEnd = j + 2
-                  break
-                end
-              end
-              j = j + 2
-            end
 
-            if funcEnd then
-              local funcSize = funcEnd - funcStart
-              if funcSize >= 12 and funcSize <= 128 then
-                local blCount = 0
-                local blTargets = {}
-                local callsSwarp = false
-                local k = funcStart
-                while k <= funcEnd - 4 do
-                  local h = strU16(data, k)
-                  local l = strU16(data, k + 2)
-                  if h and l and (h & 0xF800) == 0xF000 and (l & 0xF800) == 0xF800 then
-                    blCount = blCount + 1
-                    local blPC = 0x08000000 + (rangeStart + k - 1) + 4
-                    local target = decodeBL(h, l, blPC)
-                    table.insert(blTargets, target)
-                    if targets[target] or targets[target & 0xFFFFFFFE] then
-                      callsSwarp = true
-                    end
-                    k = k + 4
-                  else
-                    k = k + 2
-                  end
-                end
-
-                if blCount >= 2 and blCount <= 5 and callsSwarp then
-                  local funcAddr = 0x08000000 + (rangeStart + funcStart - 1) + 1
-                  -- Exclude functions that ARE Phase 2 (they reference sWarpDestination directly,
-                  -- but WarpIntoMap does NOT — it only CALLS Phase 2 functions)
-                  local isPhase2 = false
-                  for _, f in ipairs(swarpFuncs) do
-                    if f.addr == funcAddr then isPhase2 = true; break end
-                  end
-                  if not isPhase2 then
-                    local dup = false
-                    for _, c in ipairs(candidates) do
-                      if c.addr == funcAddr then dup = true; break end
-                    end
-                    if not dup then
-                      table.insert(candidates, { addr = funcAddr, size = funcSize, blTargets = blTargets, blCount = blCount })
-                    end
-                  end
-                end
-              end
+      local lastI = dataLen - 3
+      local siteIdx = 1
+      -- Jump between PUSH high bytes (0xB4/0xB5) with a C-level class search;
+      -- only hits on the high byte of a halfword (even 1-based pos) are PUSHes.
+      local hit = #callSites > 0 and strfind(data, PUSH_HI_PATTERN, 2)
+      while hit and hit - 1 <= lastI do
+        local funcStart = hit - 1
+        while callSites[siteIdx] and callSites[siteIdx] <= funcStart do
+          siteIdx = siteIdx + 1
+        end
+        local site = callSites[siteIdx]
+        if hit % 2 == 0 and site and site <= funcStart + 126 then
+          local fn = analyzeThumbFunction(data, funcStart, rangeStart)
+          if fn and fn.size >= 12 and fn.size <= 128 and fn.blCount >= 2 and fn.blCount <= 5
+              and callsAnyTarget(fn, targets) then
+            -- Exclude functions that ARE Phase 2 (they reference sWarpDestination directly,
+            -- but WarpIntoMap does NOT — it only CALLS Phase 2 functions)
+            if not swarpFuncSet[fn.addr] and not candidateSet[fn.addr] then
+              candidateSet[fn.addr] = true
+              table.insert(candidates, fn)
             end
           end
-          i = i + 2
         end
+        hit = strfind(data, PUSH_HI_PATTERN, hit + 1)
       end
     end
   end
 
-  console:log(string.format("[HAL] Phase 3: %d WarpIntoMap candidates (after Phase 2 exclusion)", #candidates))
+  scanLog(string.format("[HAL] Phase 3: %d WarpIntoMap candidates (after Phase 2 exclusion)", #candidates))
 
   if #candidates > 0 then
     -- Log all candidates for debugging
-    for ci, c in ipairs(candidates) do
-      console:log(string.format("[HAL]   Candidate %d: 0x%08X (%d bytes, %d BLs)", ci, c.addr, c.size, c.blCount))
-      for j, t in ipairs(c.blTargets) do
-        console:log(string.format("[HAL]     BL%d -> 0x%08X", j, t))
-      end
-    end
+    logWarpCandidates("Candidate", candidates)
     -- Prefer functions with exactly 3 BLs (vanilla WarpIntoMap has 3), then smallest
     table.sort(candidates, function(a, b)
       local aPrefer = (a.blCount == 3) and 0 or 1
@@ -1374,122 +1874,54 @@ function HAL.scanROMForWarpFunction()
       return a.size < b.size
     end)
     warpIntoMapAddr = candidates[1].addr
-    console:log(string.format("[HAL] WarpIntoMap SELECTED: 0x%08X (%d bytes, %d BLs)", warpIntoMapAddr, candidates[1].size, candidates[1].blCount))
+    scanLog(string.format("[HAL] WarpIntoMap SELECTED: 0x%08X (%d bytes, %d BLs)", warpIntoMapAddr, candidates[1].size, candidates[1].blCount))
     return true
   end
 
   -- ===== PHASE 3b: Cross-reference CB2_LoadMap literal pool with Phase 2 functions =====
   -- WarpIntoMap contains LDR R0,=CB2_LoadMap in its literal pool AND BL to a Phase 2 func.
   -- Find functions that reference BOTH CB2_LoadMap and sWarpDestination (via BL to Phase 2).
-  console:log("[HAL] Phase 3 found no match — trying Phase 3b (CB2_LoadMap cross-ref)...")
+  scanLog("[HAL] Phase 3 found no match — trying Phase 3b (CB2_LoadMap cross-ref)...")
 
   local CB2_LM = config.warp.cb2LoadMap
   if CB2_LM then
-    local CB2_B0, CB2_B1 = CB2_LM & 0xFF, (CB2_LM >> 8) & 0xFF
-    local CB2_B2, CB2_B3 = (CB2_LM >> 16) & 0xFF, (CB2_LM >> 24) & 0xFF
-    local cb2LitRefs = {}
-
-    -- Find CB2_LoadMap in ROM literal pools (4096-byte chunks)
-    for base = 0, SCAN_SIZE - CHUNK, CHUNK do
-      local ok, data = pcall(emu.memory.cart0.readRange, emu.memory.cart0, base, CHUNK)
-      if ok and data then
-        for i = 1, #data - 3, 4 do
-          local b0, b1, b2, b3 = string.byte(data, i, i + 3)
-          if b0 == CB2_B0 and b1 == CB2_B1 and b2 == CB2_B2 and b3 == CB2_B3 then
-            table.insert(cb2LitRefs, base + i - 1)
-          end
-        end
-      end
-    end
+    -- CB2_LoadMap literal pool refs (already collected by the Phase 1 pass)
+    local cb2LitRefs = findROMLiteralRefs({ CB2_LM })[CB2_LM]
 
-    console:log(string.format("[HAL] Phase 3b: %d CB2_LoadMap literal pool refs", #cb2LitRefs))
+    scanLog(string.format("[HAL] Phase 3b: %d CB2_LoadMap literal pool refs", #cb2LitRefs))
 
     -- For each CB2_LoadMap literal, find containing function and check if it calls a Phase 2 func
     local p3bCandidates = {}
+    local p3bCandidateSet = {}
     for _, litOff in ipairs(cb2LitRefs) do
       -- Walk back up to 128 bytes to find PUSH prologue
       local searchStart = math.max(0, litOff - 128)
       local readLen = math.min(litOff - searchStart + 64, 256)  -- include function body past literal ref
-      local ok, data = pcall(emu.memory.cart0.readRange, emu.memory.cart0, searchStart, readLen)
-      if ok and data then
-        -- Find the last PUSH before litOff
-        local funcStartPos = nil
-        for pos = 1, (litOff - searchStart), 2 do
-          local instr = strU16(data, pos)
-          if instr and ((instr & 0xFF00) == 0xB400 or (instr & 0xFF00) == 0xB500) then
-            funcStartPos = pos  -- keep updating; last PUSH before literal = most likely prologue
-          end
-        end
+      local data = readROMRange(searchStart, readLen)
+      if data then
+        -- Find the last PUSH before litOff (most likely prologue)
+        local funcStartPos = findLastPush(data, math.min(litOff - searchStart, #data - 1))
 
         if funcStartPos then
-          -- Find function end (POP {PC} or BX LR)
-          local funcEndPos = nil
-          for pos = funcStartPos + 2, math.min(funcStartPos + 128, #data - 1), 2 do
-            local instr = strU16(data, pos)
-            if instr and ((instr & 0xFF00) == 0xBD00 or instr == 0x4770) then
-              funcEndPos = pos + 2
-              break
-            end
-          end
-
-          if funcEndPos then
-            local funcSize = funcEndPos - funcStartPos
-            if funcSize >= 12 and funcSize <= 128 then
-              -- Count BLs and check if any targets a Phase 2 function
-              local blCount = 0
-              local blTargets = {}
-              local callsPhase2 = false
-              local k = funcStartPos
-              while k <= funcEndPos - 4 do
-                local h = strU16(data, k)
-                local l = strU16(data, k + 2)
-                if h and l and (h & 0xF800) == 0xF000 and (l & 0xF800) == 0xF800 then
-                  blCount = blCount + 1
-                  local blPC = 0x08000000 + (searchStart + k - 1) + 4
-                  local target = decodeBL(h, l, blPC)
-                  table.insert(blTargets, target)
-                  if targets[target] or targets[target & 0xFFFFFFFE] then
-                    callsPhase2 = true
-                  end
-                  k = k + 4
-                else
-                  k = k + 2
-                end
-              end
-
-              if blCount >= 2 and blCount <= 5 and callsPhase2 then
-                local funcAddr = 0x08000000 + (searchStart + funcStartPos - 1) + 1
-                -- Exclude Phase 2 functions (WarpIntoMap does NOT reference sWarpDestination directly)
-                local isPhase2 = false
-                for _, f in ipairs(swarpFuncs) do
-                  if f.addr == funcAddr then isPhase2 = true; break end
-                end
-                if not isPhase2 then
-                  local dup = false
-                  for _, c in ipairs(p3bCandidates) do
-                    if c.addr == funcAddr then dup = true; break end
-                  end
-                  if not dup then
-                    table.insert(p3bCandidates, { addr = funcAddr, size = funcSize, blTargets = blTargets, blCount = blCount })
-                  end
-                end
-              end
+          local fn = analyzeThumbFunction(data, funcStartPos, searchStart)
+          -- Count BLs and check if any targets a Phase 2 function
+          if fn and fn.size >= 12 and fn.size <= 128 and fn.blCount >= 2 and fn.blCount <= 5
+              and callsAnyTarget(fn, targets) then
+            -- Exclude Phase 2 functions (WarpIntoMap does NOT reference sWarpDestination directly)
+            if not swarpFuncSet[fn.addr] and not p3bCandidateSet[fn.addr] then
+              p3bCandidateSet[fn.addr] = true
+              table.insert(p3bCandidates, fn)
             end
           end
         end
       end
     end
 
-    console:log(string.format("[HAL] Phase 3b: %d WarpIntoMap candidates (after Phase 2 exclusion)", #p3bCandidates))
+    scanLog(string.format("[HAL] Phase 3b: %d WarpIntoMap candidates (after Phase 2 exclusion)", #p3bCandidates))
 
     if #p3bCandidates > 0 then
       -- Log all candidates for debugging
-      for ci, c in ipairs(p3bCandidates) do
-        console:log(string.format("[HAL]   P3b Candidate %d: 0x%08X (%d bytes, %d BLs)", ci, c.addr, c.size, c.blCount))
-        for j, t in ipairs(c.blTargets) do
-          console:log(string.format("[HAL]     BL%d -> 0x%08X", j, t))
-        end
-      end
+      logWarpCandidates("P3b Candidate", p3bCandidates)
       table.sort(p3bCandidates, function(a, b)
         local aPrefer = (a.blCount == 3) and 0 or 1
         local bPrefer = (b.blCount == 3) and 0 or 1
@@ -1497,16 +1929,43 @@ function HAL.scanROMForWarpFunction()
         return a.size < b.size
       end)
       warpIntoMapAddr = p3bCandidates[1].addr
-      console:log(string.format("[HAL] WarpIntoMap SELECTED via Phase 3b: 0x%08X (%d bytes, %d BLs)",
+      scanLog(string.format("[HAL] WarpIntoMap SELECTED via Phase 3b: 0x%08X (%d bytes, %d BLs)",
         warpIntoMapAddr, p3bCandidates[1].size, p3bCandidates[1].blCount))
       return true
     end
   end
 
-  console:log("[HAL] Phase 3b found no match — trying CB2_LoadMap fallback...")
+  scanLog("[HAL] Phase 3b found no match — trying CB2_LoadMap fallback...")
   return HAL.findWarpViaCallback()
 end
 
+function HAL.scanROMForWarpFunction()
+  -- Share ROM chunks across all phases of this scan, then release them
+  romChunkCache = {}
+  thumbFunctionCache = {}
+  scanLogLines = {}
+  pendingScanFingerprint = nil
+  local ok, found = pcall(scanROMForWarp)
+  romChunkCache = nil
+  thumbFunctionCache = nil
+  -- Only successful scans are kept: reloading the script retries a failed one
+  if ok and found and pendingScanFingerprint then
+    _G.__pokecoopWarpScanCache = {
+      fingerprint = pendingScanFingerprint,
+      warpIntoMapAddr = warpIntoMapAddr,
+      loadCurrentMapDataAddr = loadCurrentMapDataAddr,
+    }
+  end
+  pendingScanFingerprint = nil
+  local logLines = scanLogLines
+  scanLogLines = nil
+  if #logLines > 0 then
+    console:log(table.concat(logLines, "\n"))
+  end
+  if not ok then error(found, 0) end
+  return found
+end
+
 --[[
   Fallback: Find WarpIntoMap by analyzing BL targets near CB2_LoadMap literal pool refs.
   In Task_WarpAndLoadMap state 2: BL WarpIntoMap, LDR R0 =CB2_LoadMap, BL SetMainCallback2.
@@ -1517,26 +1976,12 @@ function HAL.findWarpViaCallback()
   local CB2_LM = config.warp.cb2LoadMap
   if not CB2_LM then return false end
 
-  local CB2_B0, CB2_B1 = CB2_LM & 0xFF, (CB2_LM >> 8) & 0xFF
-  local CB2_B2, CB2_B3 = (CB2_LM >> 16) & 0xFF, (CB2_LM >> 24) & 0xFF
-  local SCAN_SIZE = 0x800000
-  local CHUNK = 4096
+  local SCAN_SIZE = romScanEnd()
 
-  -- Find CB2_LoadMap literal pool entries
-  local cb2Refs = {}
-  for base = 0, SCAN_SIZE - CHUNK, CHUNK do
-    local ok, data = pcall(emu.memory.cart0.readRange, emu.memory.cart0, base, CHUNK)
-    if ok and data then
-      for i = 1, #data - 3, 4 do
-        local b0, b1, b2, b3 = string.byte(data, i, i + 3)
-        if b0 == CB2_B0 and b1 == CB2_B1 and b2 == CB2_B2 and b3 == CB2_B3 then
-          table.insert(cb2Refs, base + i - 1)
-        end
-      end
-    end
-  end
+  -- Find CB2_LoadMap literal pool entries (cached when the Phase 1 pass already ran)
+  local cb2Refs = findROMLiteralRefs({ CB2_LM })[CB2_LM]
 
-  console:log(string.format("[HAL] Fallback: %d CB2_LoadMap refs in ROM", #cb2Refs))
+  scanLog(string.format("[HAL] Fallback: %d CB2_LoadMap refs in ROM", #cb2Refs))
 
   -- For each literal, find the LDR that loads it, then extract BL target before it
   local blTargetCounts = {}
@@ -1544,29 +1989,33 @@ function HAL.findWarpViaCallback()
   for _, litOff in ipairs(cb2Refs) do
     local readStart = math.max(0, litOff - 256)
     local readLen = litOff - readStart + 4
-    local ok, data = pcall(emu.memory.cart0.readRange, emu.memory.cart0, readStart, readLen)
-    if ok and data then
-      for pos = 1, #data - 1, 2 do
-        local instr = strU16(data, pos)
-        if instr and (instr & 0xF800) == 0x4800 then
+    local data = readROMRange(readStart, readLen)
+    if data then
+      -- PC bases hoisted out of the loop: the halfword at 1-based pos sits at
+      -- cart0 offset readStart + pos - 1, so its PC (offset + 4) is pcBase + pos.
+      local pcBase = readStart + 3
+      local romPCBase = ROM_BASE + pcBase
+      -- Only the high byte is needed to reject non-LDR halfwords (0x48-0x4F):
+      -- string.find jumps between such bytes, and only even 1-based hits
+      -- (high byte of a halfword) are LDR instructions. The search starts at
+      -- pos 5 (hit 6): an LDR any earlier has no room for the BL pair before it.
+      local hit = strfind(data, LDR_PC_HI_PATTERN, 6)
+      while hit do
+        if hit % 2 == 0 then
+          local pos = hit - 1
           -- LDR Rd, [PC, #imm8*4]
-          local instrRomOff = readStart + pos - 1
-          local imm8 = instr & 0xFF
-          local effPC = (instrRomOff + 4) & 0xFFFFFFFC
-          local loadAddr = effPC + imm8 * 4
+          local loadAddr = ((pcBase + pos) & 0xFFFFFFFC) + strbyte(data, pos) * 4
           if loadAddr == litOff then
             -- Found LDR that loads CB2_LoadMap. Check BL before it.
-            if pos >= 5 then
-              local blH = strU16(data, pos - 4)
-              local blL = strU16(data, pos - 2)
-              if blH and blL and (blH & 0xF800) == 0xF000 and (blL & 0xF800) == 0xF800 then
-                local blPC = 0x08000000 + (readStart + pos - 5) + 4
-                local target = decodeBL(blH, blL, blPC)
-                blTargetCounts[target] = (blTargetCounts[target] or 0) + 1
-              end
+            local blH, blL = strunpack(BL_PAIR_FMT, data, pos - 4)
+            if THUMB_OP_CLASS[blH >> 8] == OP_BL_HI and THUMB_OP_CLASS[blL >> 8] == OP_BL_LO then
+              -- The BL pair starts at pos - 4
+              local target = decodeBL(blH, blL, romPCBase + pos - 4)
+              blTargetCounts[target] = (blTargetCounts[target] or 0) + 1
             end
           end
         end
+        hit = strfind(data, LDR_PC_HI_PATTERN, hit + 1)
       end
     end
   end
@@ -1578,51 +2027,26 @@ function HAL.findWarpViaCallback()
   end
   table.sort(sorted, function(a, b) return a.count > b.count end)
 
-  console:log(string.format("[HAL] Fallback: %d unique BL targets before LDR =CB2_LoadMap", #sorted))
+  local fbLines = { string.format("[HAL] Fallback: %d unique BL targets before LDR =CB2_LoadMap", #sorted) }
   for i = 1, math.min(5, #sorted) do
-    console:log(string.format("[HAL]   0x%08X (x%d)", sorted[i].addr, sorted[i].count))
+    fbLines[#fbLines + 1] = string.format("[HAL]   0x%08X (x%d)", sorted[i].addr, sorted[i].count)
   end
+  scanLog(table.concat(fbLines, "\n"))
 
   -- Verify candidates: should be small function with 3 BL calls
   for _, st in ipairs(sorted) do
-    local funcRomOff = (st.addr & 0xFFFFFFFE) - 0x08000000
+    local funcRomOff = (st.addr & 0xFFFFFFFE) - ROM_BASE
     if funcRomOff >= 0 and funcRomOff < SCAN_SIZE then
       local readLen = math.min(128, SCAN_SIZE - funcRomOff)
-      local ok, data = pcall(emu.memory.cart0.readRange, emu.memory.cart0, funcRomOff, readLen)
-      if ok and data and #data >= 2 then
-        local firstInstr = strU16(data, 1)
-        if firstInstr and ((firstInstr & 0xFF00) == 0xB400 or (firstInstr & 0xFF00) == 0xB500) then
-          local funcEnd = nil
-          local blCount = 0
-          local pos = 1
-          while pos <= #data - 1 do
-            local instr = strU16(data, pos)
-            if instr and pos > 2 and ((instr & 0xFF00) == 0xBD00 or instr == 0x4770) then
-              funcEnd = pos + 2
-              break
-            end
-            if pos <= #data - 3 then
-              local next = strU16(data, pos + 2)
-              if instr and next and (instr & 0xF800) == 0xF000 and (next & 0xF800) == 0xF800 then
-                blCount = blCount + 1
-                pos = pos + 4
-              else
-                pos = pos + 2
-              end
-            else
-              pos = pos + 2
-            end
-          end
-
-          if funcEnd then
-            local funcSize = funcEnd - 1
-            if blCount >= 2 and blCount <= 5 and funcSize >= 12 and funcSize <= 128 then
-              warpIntoMapAddr = st.addr | 1
-              console:log(string.format("[HAL] WarpIntoMap FOUND via fallback at 0x%08X (%d bytes, 3 BL, x%d refs)",
-                warpIntoMapAddr, funcSize, st.count))
-              return true
-            end
-          end
+      local data = readROMRange(funcRomOff, readLen)
+      -- Same decoder (and memo) as Phase 3/3b; the PUSH prologue is checked here
+      if data and #data >= 2 and THUMB_OP_CLASS[strbyte(data, 2)] == OP_PUSH then
+        local fn = analyzeThumbFunction(data, 1, funcRomOff)
+        if fn and fn.blCount >= 2 and fn.blCount <= 5 and fn.size >= 12 and fn.size <= 128 then
+          warpIntoMapAddr = st.addr | 1
+          scanLog(string.format("[HAL] WarpIntoMap FOUND via fallback at 0x%08X (%d bytes, 3 BL, x%d refs)",
+            warpIntoMapAddr, fn.size, st.count))
+          return true
         end
       end
     end
@@ -1634,13 +2058,13 @@ function HAL.findWarpViaCallback()
   -- We can build a simpler trampoline: call LoadCurrentMapData, then write callback2 = CB2_LoadMap.
   if #sorted > 0 then
     loadCurrentMapDataAddr = sorted[1].addr | 1  -- THUMB bit
-    console:log(string.format("[HAL] WarpIntoMap inlined — using LoadCurrentMapData=0x%08X (x%d refs) for simple trampoline",
+    scanLog(string.format("[HAL] WarpIntoMap inlined — using LoadCurrentMapData=0x%08X (x%d refs) for simple trampoline",
       loadCurrentMapDataAddr, sorted[1].count))
     return true  -- signal success — triggerMapLoad will use the simple trampoline path
   end
 
-  console:log("[HAL] WARNING: WarpIntoMap AND LoadCurrentMapData not found — forced warp will use direct CB2_LoadMap (may hang)")
-  console:log("[HAL] Set config.warp.warpIntoMapAddr = <address> in run_and_bun.lua for manual override")
+  scanLog("[HAL] WARNING: WarpIntoMap AND LoadCurrentMapData not found — forced warp will use direct CB2_LoadMap (may hang)")
+  scanLog("[HAL] Set config.warp.warpIntoMapAddr = <address> in run_and_bun.lua for manual override")
   return false
 end
 
@@ -1802,12 +2226,12 @@ function HAL.injectROMTrampoline()
     if ok and data and #data == NEEDED then
       -- Check if all bytes are 0xFF (unused ROM padding) or 0x00
       local isFree = true
-      local firstByte = string.byte(data, 1)
+      local firstByte = strbyte(data, 1)
       if firstByte ~= 0xFF and firstByte ~= 0x00 then
         isFree = false
       else
         for i = 2, NEEDED do
-          if string.byte(data, i) ~= firstByte then
+          if strbyte(data, i) ~= firstByte then
             isFree = false
             break
           end
@@ -1831,7 +2255,7 @@ function HAL.injectROMTrampoline()
         -- Verify by reading back first instruction
         local okV, verify = pcall(emu.memory.cart0.read16, emu.memory.cart0, offset)
         if okV and verify == 0xB510 then
-          trampolineAddr = 0x08000000 + offset + 1  -- ROM base + offset + THUMB bit
+          trampolineAddr = ROM_BASE + offset + 1  -- ROM base + offset + THUMB bit
           console:log(string.format("[HAL] ROM trampoline injected at 0x%08X (verified OK, LoadCurrentMapData=0x%08X)",
             trampolineAddr - 1, loadCurrentMapDataAddr))
           return trampolineAddr
@@ -2270,6 +2694,38 @@ function HAL.readOAMEntry(index)
   return readHardwareOAMEntry(index)
 end
 
+local OAM_TABLE_BYTES = 128 * OAM_ENTRY_BYTES
+
+--[[
+  Read all 128 OAM entries with one readRange.
+  Same source order as HAL.readOAMEntry: engine OAM buffer, then hardware OAM.
+  @return string of 128 * 8 bytes (attr0, attr1, attr2 as little-endian u16 at
+          entry offset 0/2/4), or nil on error
+]]
+function HAL.readOAMTable()
+  if oamBufferAddr then
+    local domain, offset
+    if isValidIWRAM(oamBufferAddr) and isValidIWRAM(oamBufferAddr + OAM_TABLE_BYTES - 1) then
+      domain, offset = emu.memory.iwram, toIWRAMOffset(oamBufferAddr)
+    elseif isValidWRAM(oamBufferAddr) and isValidWRAM(oamBufferAddr + OAM_TABLE_BYTES - 1) then
+      domain, offset = emu.memory.wram, toWRAMOffset(oamBufferAddr)
+    end
+    if domain then
+      local ok, data = pcall(domain.readRange, domain, offset, OAM_TABLE_BYTES)
+      if ok and data and #data == OAM_TABLE_BYTES then
+        return data
+      end
+    end
+  end
+
+  local oam = emu.memory.oam
+  local ok, data = pcall(oam.readRange, oam, 0, OAM_TABLE_BYTES)
+  if ok and data and #data == OAM_TABLE_BYTES then
+    return data
+  end
+  return nil
+end
+
 --[[
   Read sprite tiles from VRAM (4bpp, 32 bytes per tile)
   Sprites are stored in VRAM at offset 0x10000 (obj tile base)
@@ -2300,6 +2756,24 @@ function HAL.readSpriteTiles(tileIndex, numTiles)
   return nil
 end
 
+-- 16 little-endian BGR555 halfwords (one palette bank)
+local PALETTE_BANK_FMT = "<" .. string.rep("I2", 16)
+
+--[[
+  Read one 16-color palette bank with a single readRange + unpack
+  @param offset Palette RAM offset of the bank
+  @return table of 16 BGR555 values (indexed 0-15), or nil on error
+]]
+local function readPaletteBank(offset)
+  local ok, data = pcall(emu.memory.palette.readRange, emu.memory.palette, offset, 32)
+  if not ok or not data or #data < 32 then
+    return nil
+  end
+  local c0, c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, c11, c12, c13, c14, c15 =
+    string.unpack(PALETTE_BANK_FMT, data)
+  return { [0] = c0, c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, c11, c12, c13, c14, c15 }
+end
+
 --[[
   Read a sprite palette bank (16 colors, BGR555 format)
   Sprite palettes start at palette RAM offset 0x200
@@ -2311,19 +2785,7 @@ function HAL.readSpritePalette(bank)
     return nil
   end
 
-  local success, palette = pcall(function()
-    local pal = {}
-    local base = 0x200 + bank * 32
-    for i = 0, 15 do
-      pal[i] = emu.memory.palette:read16(base + i * 2)
-    end
-    return pal
-  end)
-
-  if success and palette then
-    return palette
-  end
-  return nil
+  return readPaletteBank(0x200 + bank * 32)
 end
 
 --[[
@@ -2465,16 +2927,17 @@ function HAL.allocateGhostOAMSlots(count)
   end
 
   if ghostOamStrategy ~= "dynamic" then
-    dynamicGhostOAMIndices = nil
+    setDynamicGhostOAMIndices(nil)
     return HAL.getActiveGhostOAMIndices()
   end
 
   local free = HAL.findFreeOAMSlots(requested)
   if #free >= requested then
-    dynamicGhostOAMIndices = {}
+    local indices = {}
     for i = 1, requested do
-      dynamicGhostOAMIndices[i] = free[i]
+      indices[i] = free[i]
     end
+    setDynamicGhostOAMIndices(indices)
     dynamicOAMFallbackWarned = false
     return copyArray(dynamicGhostOAMIndices)
   end
@@ -2487,7 +2950,7 @@ function HAL.allocateGhostOAMSlots(count)
       fallback[#fallback + 1] = idx
     end
   end
-  dynamicGhostOAMIndices = fallback
+  setDynamicGhostOAMIndices(fallback)
   if not dynamicOAMFallbackWarned then
     console:log("[HAL] WARNING: dynamic ghost OAM allocation failed; using fixed fallback range")
     dynamicOAMFallbackWarned = true
@@ -2631,8 +3094,14 @@ function HAL.writeGhostTilesToVRAM(ghostSlot, tileData)
 
   local ok = pcall(function()
     if type(tileData) == "string" then
-      for i = 1, length do
-        emu.memory.vram:write8(vramOffset + i - 1, string.byte(tileData, i))
+      -- Whole words go through write32 (a quarter of the host calls), any tail bytewise
+      local vram = emu.memory.vram
+      local words = (vramOffset & 3) == 0 and (length >> 2) or 0
+      for w = 0, words - 1 do
+        vram:write32(vramOffset + w * 4, (strunpack("<I4", tileData, w * 4 + 1)))
+      end
+      for i = words * 4 + 1, length do
+        vram:write8(vramOffset + i - 1, strbyte(tileData, i))
       end
     else
       for i = 1, length do
@@ -2643,15 +3112,21 @@ function HAL.writeGhostTilesToVRAM(ghostSlot, tileData)
   return ok
 end
 
+-- Memoized conversions keyed by the 24-bit RGB part (alpha never affects the result)
+local bgr555ByRgb = {}
+
 local function argbToBgr555(color)
-  local c = tonumber(color) or 0
-  local r8 = (c >> 16) & 0xFF
-  local g8 = (c >> 8) & 0xFF
-  local b8 = c & 0xFF
-  local r5 = math.floor((r8 + 4) / 8) & 0x1F
-  local g5 = math.floor((g8 + 4) / 8) & 0x1F
-  local b5 = math.floor((b8 + 4) / 8) & 0x1F
-  return r5 | (g5 << 5) | (b5 << 10)
+  local rgb = (tonumber(color) or 0) & 0xFFFFFF
+  local bgr = bgr555ByRgb[rgb]
+  if bgr then
+    return bgr
+  end
+  local r5 = (((rgb >> 16) + 4) >> 3) & 0x1F
+  local g5 = ((((rgb >> 8) & 0xFF) + 4) >> 3) & 0x1F
+  local b5 = (((rgb & 0xFF) + 4) >> 3) & 0x1F
+  bgr = r5 | (g5 << 5) | (b5 << 10)
+  bgr555ByRgb[rgb] = bgr
+  return bgr
 end
 
 --[[
@@ -2811,18 +3286,7 @@ function HAL.readBGPalette(palBank)
     return nil
   end
 
-  local success, palette = pcall(function()
-    local pal = {}
-    local base = palBank * 32  -- BG palettes at 0x000 (not 0x200)
-    for i = 0, 15 do
-      pal[i] = emu.memory.palette:read16(base + i * 2)
-    end
-    return pal
-  end)
-  if success and palette then
-    return palette
-  end
-  return nil
+  return readPaletteBank(palBank * 32)  -- BG palettes at 0x000 (not 0x200)
 end
 
 return HAL
@@ -94,16 +94,48 @@ local function copyPos(pos)
   }
 end
 
-local function positionMapKey(pos)
-  if type(pos) ~= "table" then
+-- Formatted "group:id" keys, cached per mapGroup/mapId pair
+local mapKeyText = {}
+
+--[[
+  Map key "group:id", formatted once per map. Shared with main and render,
+  which look up map keys per ghost per frame.
+
+  @param mapGroup number|nil
+  @param mapId    number|nil
+  @return string|nil  nil if either part is missing
+]]
+function Interpolate.mapKey(mapGroup, mapId)
+  if mapGroup == nil or mapId == nil then
     return nil
   end
-  if pos.mapGroup == nil or pos.mapId == nil then
+  mapGroup = tonumber(mapGroup) or -1
+  mapId = tonumber(mapId) or -1
+  local byId = mapKeyText[mapGroup]
+  local key = byId and byId[mapId]
+  if not key then
+    key = string.format("%d:%d", mapGroup, mapId)
+    if not byId then
+      byId = {}
+      mapKeyText[mapGroup] = byId
+    end
+    byId[mapId] = key
+  end
+  return key
+end
+
+local function positionMapKey(pos)
+  if type(pos) ~= "table" then
     return nil
   end
-  return string.format("%d:%d", tonumber(pos.mapGroup) or -1, tonumber(pos.mapId) or -1)
+  return Interpolate.mapKey(pos.mapGroup, pos.mapId)
 end
 
+-- Last formatted "group:id@rev" key per map key. mapRev only grows, so older
+-- revisions are never asked for again and only the latest one is kept.
+local metaKeyRev = {}
+local metaKeyText = {}
+
 local function positionMetaKey(pos, mapRev)
   local mapKey = positionMapKey(pos)
   if mapKey == nil then
@@ -113,7 +145,11 @@ local function positionMetaKey(pos, mapRev)
   if rev == nil then
     rev = tonumber(pos and pos.mapRev) or 0
   end
-  return string.format("%s@%d", mapKey, rev)
+  if metaKeyRev[mapKey] ~= rev then
+    metaKeyRev[mapKey] = rev
+    metaKeyText[mapKey] = string.format("%s@%d", mapKey, rev)
+  end
+  return metaKeyText[mapKey]
 end
 
 local function hasProjectionMeta(pos)
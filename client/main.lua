@@ -65,23 +65,35 @@ local function installTimestampedConsoleLogging()
       __pokecoop_raw_console = rawConsole,
     }
 
+    -- HH:MM:SS only changes once per second; reuse it instead of os.date per log call
+    local cachedWallSec = nil
+    local cachedWallText = nil
+
     function wrapper:log(...)
       local clockNow = os.clock()
       local elapsedMs = math.floor((clockNow - (_G.__pokecoopLogStartClock or clockNow)) * 1000 + 0.5)
       if elapsedMs < 0 then
         elapsedMs = 0
       end
-      local wallSec = (_G.__pokecoopLogStartWallSec or os.time()) + math.floor(elapsedMs / 1000)
-      local wall = os.date("*t", wallSec)
-      local ms = elapsedMs % 1000
-      local prefix = string.format("[%02d:%02d:%02d.%03d +%dms]", wall.hour, wall.min, wall.sec, ms, elapsedMs)
+      local wallSec = (_G.__pokecoopLogStartWallSec or os.time()) + elapsedMs // 1000
+      if wallSec ~= cachedWallSec then
+        local wall = os.date("*t", wallSec)
+        cachedWallText = string.format("%02d:%02d:%02d", wall.hour, wall.min, wall.sec)
+        cachedWallSec = wallSec
+      end
+      local prefix = string.format("[%s.%03d +%dms]", cachedWallText, elapsedMs % 1000, elapsedMs)
 
-      local parts = {}
+      local payload
       local argCount = select("#", ...)
-      for i = 1, argCount do
-        parts[#parts + 1] = tostring(select(i, ...))
+      if argCount == 1 then
+        payload = tostring((...))
+      else
+        local parts = {}
+        for i = 1, argCount do
+          parts[#parts + 1] = tostring(select(i, ...))
+        end
+        payload = table.concat(parts, " ")
       end
-      local payload = table.concat(parts, " ")
 
       rawConsole:log(prefix .. " " .. payload)
     end
@@ -154,6 +166,16 @@ local GHOST_RENDER_CAPTURE_CONFIDENCE_MIN = 0.05
 local GHOST_RENDER_CONTEXT_GRACE_FRAMES = 6
 local GHOST_RENDER_DIAG_INTERVAL_FRAMES = 300
 
+-- Opponent's duel outcome -> ours (PvP: opponent "win" = we "lose", "lose"/"flee"/"forfeit" = we "win").
+-- Anything else mirrors to "completed".
+local MIRRORED_DUEL_OUTCOME = {
+  win = "lose",
+  lose = "win",
+  flee = "win",
+  forfeit = "win",
+  draw = "draw",
+}
+
 -- Early detection constants
 local INPUT_CAMERA_MAX_GAP = 3     -- Max frames between input and camera for validation
 local INPUT_TIMEOUT = 5            -- Frames before abandoning input without camera confirm
@@ -303,6 +325,11 @@ local function log(message)
   if _G._diagLog then _G._diagLog("[PokéCoop] " .. message) end
 end
 
+-- True when log() has a sink; per-frame callers check it before formatting
+local function isLogEnabled()
+  return ENABLE_DEBUG or _G._diagLog ~= nil
+end
+
 local function setPvpEnabled(enabled)
   local nextValue = enabled and true or false
   if State.pvpEnabled == nextValue then
@@ -410,28 +437,14 @@ local function loadConfig(filename)
 end
 
 local function detectROM()
-  -- Read game code from ROM header (0x080000AC)
-  local success, gameId = pcall(function()
-    local code = ""
-    for i = 0, 3 do
-      local byte = emu.memory.cart0:read8(0x000000AC + i)
-      if byte and byte ~= 0 then
-        code = code .. string.char(byte)
-      end
-    end
-    return code
-  end)
-
-  -- Read game title from ROM header (0x080000A0)
-  local title = ""
-  pcall(function()
-    for i = 0, 11 do
-      local byte = emu.memory.cart0:read8(0x000000A0 + i)
-      if byte and byte ~= 0 then
-        title = title .. string.char(byte)
-      end
-    end
-  end)
+  -- Read game title (0x080000A0, 12 bytes) and game code (0x080000AC, 4 bytes)
+  -- from the ROM header in one readRange; NUL padding is dropped.
+  local success, header = pcall(emu.memory.cart0.readRange, emu.memory.cart0, 0x000000A0, 16)
+  local gameId, title = nil, ""
+  if success and header and #header == 16 then
+    title = (header:sub(1, 12):gsub("\0", ""))
+    gameId = (header:sub(13, 16):gsub("\0", ""))
+  end
 
   if success and gameId then
     log("Detected ROM ID: " .. gameId)
@@ -511,10 +524,7 @@ local function mapKeyFromPosition(pos)
   if type(pos) ~= "table" then
     return nil
   end
-  if pos.mapGroup == nil or pos.mapId == nil then
-    return nil
-  end
-  return string.format("%d:%d", tonumber(pos.mapGroup) or -1, tonumber(pos.mapId) or -1)
+  return Interpolate.mapKey(pos.mapGroup, pos.mapId)
 end
 
 local function positionHasConnectionToMap(sourcePos, targetPos)
@@ -1035,11 +1045,15 @@ readCharacterName = function()
   if not ok or not sb2Addr or sb2Addr < 0x02000000 or sb2Addr > 0x0203FFFF then
     return nil
   end
+  -- One readRange for the 8 name bytes instead of a closure + pcall per byte
+  local wram = emu.memory.wram
+  local okRange, raw = pcall(wram.readRange, wram, sb2Addr - 0x02000000, 8)
+  if okRange and raw and #raw == 8 then
+    return Textbox.decodeGBAText({ string.byte(raw, 1, 8) })
+  end
   local nameBytes = {}
   for i = 0, 7 do
-    local ok2, b = pcall(function()
-      return emu.memory.wram:read8(sb2Addr - 0x02000000 + i)
-    end)
+    local ok2, b = pcall(wram.read8, wram, sb2Addr - 0x02000000 + i)
     nameBytes[i + 1] = (ok2 and b) or 0xFF
   end
   return Textbox.decodeGBAText(nameBytes)
@@ -1221,7 +1235,8 @@ local function buildRemotePositionDebugSnapshot(currentPos)
     transitionProgress = tonumber(currentRemotePos and currentRemotePos.transitionProgress) or nil,
   }
 
-  if REMOTE_POS_DEBUG_CONSOLE then
+  -- Built every frame, so only format it when log() would actually write it
+  if REMOTE_POS_DEBUG_CONSOLE and isLogEnabled() then
     local line = string.format(
       "RemotePos[%s] T=%s | C=%s | P=%s | S=%s | XM:%s | ST:%s,%s | TP:%s",
       remotePlayerId,
@@ -1378,6 +1393,293 @@ local function drawOverlay(currentPos)
   overlay:update()
 end
 
+--[[
+  Handlers for messages received in the main (non-battle) receive loop,
+  keyed by message.type. Types without an entry are ignored.
+]]
+local mainMessageHandlers = {}
+
+mainMessageHandlers.position = function(message)
+  local envelope = parseRemotePositionEnvelope(message)
+  local rawPosition = clonePosition(message.data) or {}
+  rawPosition.mapRev = envelope.mapRev
+  rawPosition.metaStable = envelope.metaStable
+  rawPosition.metaHash = envelope.metaHash
+
+  -- Feed interpolation buffer with timestamp + duration hint
+  Interpolate.update(message.playerId, rawPosition, message.t, message.dur, envelope)
+  -- Store raw data as backup + update last seen
+  State.otherPlayers[message.playerId] = rawPosition
+  -- Store character name if provided (for duel textbox display)
+  if message.characterName then
+    State.playerNames[message.playerId] = message.characterName
+  end
+end
+
+mainMessageHandlers.sprite_update = function(message)
+  Sprite.updateFromNetwork(message.playerId, message.data)
+end
+
+mainMessageHandlers.player_disconnected = function(message)
+  Interpolate.remove(message.playerId)
+  Sprite.removePlayer(message.playerId)
+  State.otherPlayers[message.playerId] = nil
+  State.playerNames[message.playerId] = nil
+  log("Player " .. message.playerId .. " disconnected")
+end
+
+mainMessageHandlers.registered = function(message)
+  log("Registered with ID: " .. message.playerId)
+  State.playerId = message.playerId
+end
+
+mainMessageHandlers.joined = function(message)
+  log("Joined room: " .. message.roomId)
+end
+
+mainMessageHandlers.duel_request = function(message)
+  -- Incoming duel request from another player
+  local requesterName = message.requesterName
+  local requesterLabel = requesterName or message.requesterId or "unknown"
+  -- Store character name if provided
+  if requesterName and message.requesterId then
+    State.playerNames[message.requesterId] = requesterName
+  end
+  if not State.pvpEnabled then
+    if State.connected and message.requesterId then
+      Network.send({
+        type = "duel_decline",
+        requesterId = message.requesterId,
+        reason = "pvp_disabled"
+      })
+    end
+    log(string.format("Auto-declined duel from %s (PvP OFF)",
+      requesterLabel))
+  else
+    local handled = Duel.handleRequest(message.requesterId, requesterName, State.frameCounter)
+    if handled then
+      log(string.format("Duel request from: %s (state=%s)",
+        requesterLabel, Duel.getState()))
+    elseif State.connected and message.requesterId then
+      -- If we're busy in another duel flow, reject immediately so requester doesn't hang.
+      Network.send({ type = "duel_decline", requesterId = message.requesterId })
+      log(string.format("Auto-declined duel from %s (busy state=%s)",
+        requesterLabel, Duel.getState()))
+    end
+  end
+end
+
+mainMessageHandlers.duel_warp = function(message)
+  -- Server says: both players accepted, start battle
+  if not message.coords then
+    log("ERROR: duel_warp missing coords")
+  else
+    local isMaster = message.isMaster or false
+    log(string.format("Duel accepted! master=%s — no warp (GBA-PK style)", tostring(isMaster)))
+    -- Notify duel module (clears textbox) and reset
+    Duel.onResponse("accepted")
+    Textbox.clear()
+    Duel.reset()
+
+    State.duelPending = { isMaster = isMaster }
+
+    -- Send party data immediately
+    if Battle.isConfigured() then
+      local localParty = Battle.readLocalParty()
+      if localParty then
+        Network.send({ type = "duel_party", data = localParty })
+        log("Sent local party data (" .. #localParty .. " bytes)")
+      end
+    end
+
+    -- Send player info (name/gender/trainerId for VS screen)
+    local playerInfo = Battle.getLocalPlayerInfo()
+    if playerInfo then
+      Network.send({ type = "duel_player_info", name = playerInfo.name, gender = playerInfo.gender, trainerId = playerInfo.trainerId })
+      log("Sent player info for VS screen")
+    end
+
+    -- No map warp needed — CB2_InitBattle takes over the full screen
+    State.inputsLocked = true
+    State.warpPhase = "waiting_party"
+    State.unlockClock = os.clock() + 10.0  -- 10 second real-time timeout (speedhack-safe)
+
+    -- Reset early detection + ghost OAM cache
+    State.earlyDetect.inputDir = nil
+    State.earlyDetect.predictedPos = nil
+    Render.clearGhostCache()
+  end
+end
+
+mainMessageHandlers.duel_cancelled = function(message)
+  -- Requester cancelled/disconnected, clear our prompt and pending duel
+  Duel.reset()
+  if State.duelPending then
+    State.duelPending = nil
+    State.localReady = false
+    State.opponentReady = false
+    State.inputsLocked = false
+    State.lastServerMessageClock = 0
+    State.warpPhase = nil
+  end
+  log("Duel cancelled by requester")
+end
+
+mainMessageHandlers.duel_declined = function(message)
+  Duel.onResponse("declined")
+  local reason = message.reason and (" (" .. tostring(message.reason) .. ")") or ""
+  log("Duel was declined" .. reason)
+end
+
+mainMessageHandlers.duel_party = function(message)
+  -- Received opponent's party data for PvP battle (stored for handshake)
+  State.opponentParty = message.data
+  log(string.format("Received opponent party data (%d bytes)", #message.data))
+end
+
+mainMessageHandlers.duel_buffer = function(message)
+  -- Received battle buffer data from opponent (Link Battle Emulation)
+  if Battle.isActive() then
+    Battle.onRemoteBuffer(message)
+  end
+end
+
+mainMessageHandlers.duel_buffer_cmd = function(message)
+  if Battle.isActive() then Battle.onRemoteBufferCmd(message) end
+end
+
+mainMessageHandlers.duel_buffer_resp = function(message)
+  if Battle.isActive() then Battle.onRemoteBufferResp(message) end
+end
+
+mainMessageHandlers.duel_buffer_ack = function(message)
+  if Battle.isActive() then Battle.onRemoteBufferAck(message) end
+end
+
+mainMessageHandlers.duel_choice = function(message)
+  -- Received PvP move choice from opponent
+  if Battle.isActive() then
+    Battle.onRemoteChoice(message)
+  end
+end
+
+mainMessageHandlers.duel_player_info = function(message)
+  State.opponentName = message.name
+  State.opponentGender = message.gender or 0
+  State.opponentTrainerId = message.trainerId or 0
+  log(string.format("Received opponent player info (gender=%d)", State.opponentGender))
+end
+
+mainMessageHandlers.duel_ready = function(message)
+  State.opponentReady = true
+  log("Opponent is ready (received in main loop)")
+end
+
+mainMessageHandlers.duel_stage = function(message)
+  -- Received battle stage sync from opponent
+  if Battle.isActive() or State.warpPhase == "waiting_party" then
+    Battle.onRemoteStage(message.stage)
+  end
+end
+
+mainMessageHandlers.duel_end = function(message)
+  -- Opponent's battle ended
+  log(string.format("Opponent battle ended: %s", message.outcome or "unknown"))
+end
+
+mainMessageHandlers.duel_opponent_disconnected = function(message)
+  -- Opponent disconnected during battle
+  log("Opponent disconnected during battle — returning to origin (" .. tostring(message.disconnectReason or "unknown") .. ")")
+  if Battle.isActive() then
+    Battle.reset()
+  end
+  -- No return warp — engine returns to overworld naturally (GBA-PK style)
+  State.warpPhase = nil
+  State.duelPending = nil
+  State.opponentParty = nil
+  State.opponentName = nil
+  State.opponentGender = 0
+  State.opponentTrainerId = 0
+  State.localReady = false
+  State.opponentReady = false
+  State.inputsLocked = false
+  State.lastServerMessageClock = 0
+end
+
+mainMessageHandlers.ping = function(message)
+  -- Respond to heartbeat
+  Network.send({ type = "pong" })
+end
+
+mainMessageHandlers.pong = function(message)
+  -- Heartbeat acknowledged
+end
+
+--[[
+  Handlers for messages received while warpPhase == "in_battle",
+  keyed by message.type. Types without an entry are ignored.
+]]
+local battleMessageHandlers = {}
+
+battleMessageHandlers.duel_buffer = function(message)
+  if Battle.isActive() then Battle.onRemoteBuffer(message) end
+end
+
+battleMessageHandlers.duel_buffer_cmd = function(message)
+  if Battle.isActive() then Battle.onRemoteBufferCmd(message) end
+end
+
+battleMessageHandlers.duel_buffer_resp = function(message)
+  if Battle.isActive() then Battle.onRemoteBufferResp(message) end
+end
+
+battleMessageHandlers.duel_buffer_ack = function(message)
+  if Battle.isActive() then Battle.onRemoteBufferAck(message) end
+end
+
+battleMessageHandlers.duel_choice = function(message)
+  if Battle.isActive() then Battle.onRemoteChoice(message) end
+end
+
+battleMessageHandlers.duel_player_info = function(message)
+  State.opponentName = message.name
+  State.opponentGender = message.gender or 0
+  State.opponentTrainerId = message.trainerId or 0
+  log(string.format("Received opponent player info during battle (gender=%d)", State.opponentGender))
+end
+
+battleMessageHandlers.duel_ready = function(message)
+  -- Late arrival, ignore (we're already in battle)
+end
+
+battleMessageHandlers.duel_stage = function(message)
+  Battle.onRemoteStage(message.stage)
+end
+
+battleMessageHandlers.duel_end = function(message)
+  -- Opponent's battle ended — force-end ours too.
+  -- In PvP, the opponent's outcome is authoritative.
+  -- Opponent "win" = we "lose", opponent "lose"/"flee"/"forfeit" = we "win".
+  local theirOutcome = message.outcome or "completed"
+  local ourOutcome = MIRRORED_DUEL_OUTCOME[theirOutcome] or "completed"
+  log(string.format("Opponent battle ended: %s → our outcome: %s", theirOutcome, ourOutcome))
+  if State.connected then
+    Network.send({ type = "duel_end", outcome = ourOutcome })
+  end
+  Battle.forceEnd(ourOutcome)
+  -- Don't clear warpPhase yet — let Battle.tick() detect DONE via isFinished()
+end
+
+battleMessageHandlers.duel_opponent_disconnected = function(message)
+  log("Opponent disconnected during battle")
+  Battle.forceEnd("completed")
+  -- Don't clear warpPhase yet — let Battle.tick() detect DONE via isFinished()
+end
+
+battleMessageHandlers.ping = function(message)
+  Network.send({ type = "pong" })
+end
+
 --[[
   Main update loop (called every frame)
 ]]
@@ -1539,48 +1841,8 @@ local function update()
           local message = Network.receive()
           if not message then break end
           State.lastServerMessageClock = os.clock()
-          if message.type == "duel_buffer" then
-            if Battle.isActive() then Battle.onRemoteBuffer(message) end
-          elseif message.type == "duel_buffer_cmd" then
-            if Battle.isActive() then Battle.onRemoteBufferCmd(message) end
-          elseif message.type == "duel_buffer_resp" then
-            if Battle.isActive() then Battle.onRemoteBufferResp(message) end
-          elseif message.type == "duel_buffer_ack" then
-            if Battle.isActive() then Battle.onRemoteBufferAck(message) end
-          elseif message.type == "duel_choice" then
-            if Battle.isActive() then Battle.onRemoteChoice(message) end
-          elseif message.type == "duel_player_info" then
-            State.opponentName = message.name
-            State.opponentGender = message.gender or 0
-            State.opponentTrainerId = message.trainerId or 0
-            log(string.format("Received opponent player info during battle (gender=%d)", State.opponentGender))
-          elseif message.type == "duel_ready" then
-            -- Late arrival, ignore (we're already in battle)
-          elseif message.type == "duel_stage" then
-            Battle.onRemoteStage(message.stage)
-          elseif message.type == "duel_end" then
-            -- Opponent's battle ended — force-end ours too.
-            -- In PvP, the opponent's outcome is authoritative.
-            -- Opponent "win" = we "lose", opponent "lose"/"flee"/"forfeit" = we "win".
-            local theirOutcome = message.outcome or "completed"
-            local ourOutcome
-            if theirOutcome == "win" then ourOutcome = "lose"
-            elseif theirOutcome == "lose" or theirOutcome == "flee" or theirOutcome == "forfeit" then ourOutcome = "win"
-            elseif theirOutcome == "draw" then ourOutcome = "draw"
-            else ourOutcome = "completed" end
-            log(string.format("Opponent battle ended: %s → our outcome: %s", theirOutcome, ourOutcome))
-            if State.connected then
-              Network.send({ type = "duel_end", outcome = ourOutcome })
-            end
-            Battle.forceEnd(ourOutcome)
-            -- Don't clear warpPhase yet — let Battle.tick() detect DONE via isFinished()
-          elseif message.type == "duel_opponent_disconnected" then
-            log("Opponent disconnected during battle")
-            Battle.forceEnd("completed")
-            -- Don't clear warpPhase yet — let Battle.tick() detect DONE via isFinished()
-          elseif message.type == "ping" then
-            Network.send({ type = "pong" })
-          end
+          local handler = battleMessageHandlers[message.type]
+          if handler then handler(message) end
         end
         Network.flush()
       end
@@ -1636,11 +1898,7 @@ local function update()
           if message.type == "duel_end" then
             -- Master's outcome received — mirror it
             local theirOutcome = message.outcome or "completed"
-            local ourOutcome
-            if theirOutcome == "win" then ourOutcome = "lose"
-            elseif theirOutcome == "lose" or theirOutcome == "flee" or theirOutcome == "forfeit" then ourOutcome = "win"
-            elseif theirOutcome == "draw" then ourOutcome = "draw"
-            else ourOutcome = "completed" end
+            local ourOutcome = MIRRORED_DUEL_OUTCOME[theirOutcome] or "completed"
             log(string.format("Master outcome received: %s → our outcome: %s", theirOutcome, ourOutcome))
             if State.connected then
               Network.send({ type = "duel_end", outcome = ourOutcome })
@@ -1767,199 +2025,10 @@ local function update()
       local message = Network.receive()
       if not message then break end
 
-      -- Handle different message types
-      if message.type == "position" then
-        local envelope = parseRemotePositionEnvelope(message)
-        local rawPosition = clonePosition(message.data) or {}
-        rawPosition.mapRev = envelope.mapRev
-        rawPosition.metaStable = envelope.metaStable
-        rawPosition.metaHash = envelope.metaHash
-
-        -- Feed interpolation buffer with timestamp + duration hint
-        Interpolate.update(message.playerId, rawPosition, message.t, message.dur, envelope)
-        -- Store raw data as backup + update last seen
-        State.otherPlayers[message.playerId] = rawPosition
-        -- Store character name if provided (for duel textbox display)
-        if message.characterName then
-          State.playerNames[message.playerId] = message.characterName
-        end
-
-      elseif message.type == "sprite_update" then
-        Sprite.updateFromNetwork(message.playerId, message.data)
-
-      elseif message.type == "player_disconnected" then
-        Interpolate.remove(message.playerId)
-        Sprite.removePlayer(message.playerId)
-        State.otherPlayers[message.playerId] = nil
-        State.playerNames[message.playerId] = nil
-        log("Player " .. message.playerId .. " disconnected")
-
-      elseif message.type == "registered" then
-        log("Registered with ID: " .. message.playerId)
-        State.playerId = message.playerId
-
-      elseif message.type == "joined" then
-        log("Joined room: " .. message.roomId)
-
-      elseif message.type == "duel_request" then
-        -- Incoming duel request from another player
-        local requesterName = message.requesterName
-        local requesterLabel = requesterName or message.requesterId or "unknown"
-        -- Store character name if provided
-        if requesterName and message.requesterId then
-          State.playerNames[message.requesterId] = requesterName
-        end
-        if not State.pvpEnabled then
-          if State.connected and message.requesterId then
-            Network.send({
-              type = "duel_decline",
-              requesterId = message.requesterId,
-              reason = "pvp_disabled"
-            })
-          end
-          log(string.format("Auto-declined duel from %s (PvP OFF)",
-            requesterLabel))
-        else
-          local handled = Duel.handleRequest(message.requesterId, requesterName, State.frameCounter)
-          if handled then
-            log(string.format("Duel request from: %s (state=%s)",
-              requesterLabel, Duel.getState()))
-          elseif State.connected and message.requesterId then
-            -- If we're busy in another duel flow, reject immediately so requester doesn't hang.
-            Network.send({ type = "duel_decline", requesterId = message.requesterId })
-            log(string.format("Auto-declined duel from %s (busy state=%s)",
-              requesterLabel, Duel.getState()))
-          end
-        end
-
-      elseif message.type == "duel_warp" then
-        -- Server says: both players accepted, start battle
-        if not message.coords then
-          log("ERROR: duel_warp missing coords")
-        else
-          local isMaster = message.isMaster or false
-          log(string.format("Duel accepted! master=%s — no warp (GBA-PK style)", tostring(isMaster)))
-          -- Notify duel module (clears textbox) and reset
-          Duel.onResponse("accepted")
-          Textbox.clear()
-          Duel.reset()
-
-          State.duelPending = { isMaster = isMaster }
-
-          -- Send party data immediately
-          if Battle.isConfigured() then
-            local localParty = Battle.readLocalParty()
-            if localParty then
-              Network.send({ type = "duel_party", data = localParty })
-              log("Sent local party data (" .. #localParty .. " bytes)")
-            end
-          end
-
-          -- Send player info (name/gender/trainerId for VS screen)
-          local playerInfo = Battle.getLocalPlayerInfo()
-          if playerInfo then
-            Network.send({ type = "duel_player_info", name = playerInfo.name, gender = playerInfo.gender, trainerId = playerInfo.trainerId })
-            log("Sent player info for VS screen")
-          end
-
-          -- No map warp needed — CB2_InitBattle takes over the full screen
-          State.inputsLocked = true
-          State.warpPhase = "waiting_party"
-          State.unlockClock = os.clock() + 10.0  -- 10 second real-time timeout (speedhack-safe)
-
-          -- Reset early detection + ghost OAM cache
-          State.earlyDetect.inputDir = nil
-          State.earlyDetect.predictedPos = nil
-          Render.clearGhostCache()
-        end
-
-      elseif message.type == "duel_cancelled" then
-        -- Requester cancelled/disconnected, clear our prompt and pending duel
-        Duel.reset()
-        if State.duelPending then
-          State.duelPending = nil
-          State.localReady = false
-          State.opponentReady = false
-          State.inputsLocked = false
-          State.lastServerMessageClock = 0
-          State.warpPhase = nil
-        end
-        log("Duel cancelled by requester")
-
-      elseif message.type == "duel_declined" then
-        Duel.onResponse("declined")
-        local reason = message.reason and (" (" .. tostring(message.reason) .. ")") or ""
-        log("Duel was declined" .. reason)
-
-      elseif message.type == "duel_party" then
-        -- Received opponent's party data for PvP battle (stored for handshake)
-        State.opponentParty = message.data
-        log(string.format("Received opponent party data (%d bytes)", #message.data))
-
-      elseif message.type == "duel_buffer" then
-        -- Received battle buffer data from opponent (Link Battle Emulation)
-        if Battle.isActive() then
-          Battle.onRemoteBuffer(message)
-        end
-
-      elseif message.type == "duel_buffer_cmd" then
-        if Battle.isActive() then Battle.onRemoteBufferCmd(message) end
-      elseif message.type == "duel_buffer_resp" then
-        if Battle.isActive() then Battle.onRemoteBufferResp(message) end
-      elseif message.type == "duel_buffer_ack" then
-        if Battle.isActive() then Battle.onRemoteBufferAck(message) end
-
-      elseif message.type == "duel_choice" then
-        -- Received PvP move choice from opponent
-        if Battle.isActive() then
-          Battle.onRemoteChoice(message)
-        end
-
-      elseif message.type == "duel_player_info" then
-        State.opponentName = message.name
-        State.opponentGender = message.gender or 0
-        State.opponentTrainerId = message.trainerId or 0
-        log(string.format("Received opponent player info (gender=%d)", State.opponentGender))
-
-      elseif message.type == "duel_ready" then
-        State.opponentReady = true
-        log("Opponent is ready (received in main loop)")
-
-      elseif message.type == "duel_stage" then
-        -- Received battle stage sync from opponent
-        if Battle.isActive() or State.warpPhase == "waiting_party" then
-          Battle.onRemoteStage(message.stage)
-        end
-
-      elseif message.type == "duel_end" then
-        -- Opponent's battle ended
-        log(string.format("Opponent battle ended: %s", message.outcome or "unknown"))
-
-      elseif message.type == "duel_opponent_disconnected" then
-        -- Opponent disconnected during battle
-        log("Opponent disconnected during battle — returning to origin (" .. tostring(message.disconnectReason or "unknown") .. ")")
-        if Battle.isActive() then
-          Battle.reset()
-        end
-        -- No return warp — engine returns to overworld naturally (GBA-PK style)
-        State.warpPhase = nil
-        State.duelPending = nil
-        State.opponentParty = nil
-        State.opponentName = nil
-        State.opponentGender = 0
-        State.opponentTrainerId = 0
-        State.localReady = false
-        State.opponentReady = false
-        State.inputsLocked = false
-        State.lastServerMessageClock = 0
-
-      elseif message.type == "ping" then
-        -- Respond to heartbeat
-        Network.send({ type = "pong" })
-
-      elseif message.type == "pong" then
-        -- Heartbeat acknowledged
-
+      -- Dispatch on message type
+      local handler = mainMessageHandlers[message.type]
+      if handler then
+        handler(message)
       end
     end
   end
@@ -2507,7 +2576,7 @@ callbacks:add("frame", function()
         _updateErrorFile = io.open("update_errors.txt", "w")
       end
       if _updateErrorFile then
-        _updateErrorFile:write(errMsg .. "\n")
+        _updateErrorFile:write(errMsg, "\n")
         _updateErrorFile:flush()
       end
     end
@@ -9,158 +9,209 @@
 -- Simple JSON encoder/decoder for Lua
 local JSON = {}
 
+-- Decimal text of 0..255, precomputed: sprite tile data is thousands of bytes
+-- per message, each of which would otherwise go through tostring.
+local BYTE_TEXT = {}
+for i = 0, 255 do
+  BYTE_TEXT[i] = tostring(i)
+end
+
 function JSON.encode(obj)
+  -- Fragments are appended to one buffer and concatenated once at the end,
+  -- instead of building (and re-copying) an intermediate string per table.
+  local buf = {}
+  local n = 0
+
   local function encodeValue(val)
     local valType = type(val)
 
     if valType == "string" then
-      return '"' .. val:gsub('\\', '\\\\'):gsub('"', '\\"'):gsub('\n', '\\n'):gsub('\r', '\\r'):gsub('\t', '\\t') .. '"'
+      n = n + 1
+      buf[n] = '"' .. val:gsub('\\', '\\\\'):gsub('"', '\\"'):gsub('\n', '\\n'):gsub('\r', '\\r'):gsub('\t', '\\t') .. '"'
     elseif valType == "number" then
-      return tostring(val)
+      n = n + 1
+      -- Floats like 1.0 index the same slot as 1 but must keep their own text
+      local text = BYTE_TEXT[val]
+      if not text or math.type(val) ~= "integer" then
+        text = tostring(val)
+      end
+      buf[n] = text
     elseif valType == "boolean" then
-      return val and "true" or "false"
+      n = n + 1
+      buf[n] = val and "true" or "false"
     elseif valType == "table" then
       local isArray = #val > 0
-      local result = {}
 
       if isArray then
+        n = n + 1
+        buf[n] = "["
         for i, v in ipairs(val) do
-          table.insert(result, encodeValue(v))
+          if i > 1 then
+            n = n + 1
+            buf[n] = ","
+          end
+          encodeValue(v)
         end
-        return "[" .. table.concat(result, ",") .. "]"
+        n = n + 1
+        buf[n] = "]"
       else
+        n = n + 1
+        buf[n] = "{"
+        local first = true
         for k, v in pairs(val) do
-          table.insert(result, '"' .. k .. '":' .. encodeValue(v))
+          n = n + 1
+          buf[n] = (first and '"' or ',"') .. k .. '":'
+          first = false
+          encodeValue(v)
         end
-        return "{" .. table.concat(result, ",") .. "}"
+        n = n + 1
+        buf[n] = "}"
       end
     elseif valType == "nil" then
-      return "null"
+      n = n + 1
+      buf[n] = "null"
     else
       error("Cannot encode type: " .. valType)
     end
   end
 
-  return encodeValue(obj)
+  encodeValue(obj)
+  return table.concat(buf)
 end
 
-function JSON.decode(str)
-  str = str:match("^%s*(.-)%s*$")
+-- Decoder: each parser takes the input and a position and returns the decoded
+-- value plus the position just past it.
+local decodeValue
 
-  local pos = 1
+local function skipWhitespace(str, pos)
+  while pos <= #str and str:sub(pos, pos):match("%s") do
+    pos = pos + 1
+  end
+  return pos
+end
 
-  local function skip_whitespace()
-    while pos <= #str and str:sub(pos, pos):match("%s") do
-      pos = pos + 1
+local function decodeString(str, pos)
+  pos = pos + 1
+  local start = pos
+  while pos <= #str do
+    if str:sub(pos, pos) == '"' and str:sub(pos - 1, pos - 1) ~= '\\' then
+      local result = str:sub(start, pos - 1)
+      result = result:gsub('\\t', '\t'):gsub('\\r', '\r'):gsub('\\n', '\n'):gsub('\\"', '"'):gsub('\\\\', '\\')
+      return result, pos + 1
     end
+    pos = pos + 1
   end
+  error("Unterminated string")
+end
 
-  local function decode_value()
-    skip_whitespace()
+local function decodeNumber(str, pos)
+  local start = pos
+  while pos <= #str and str:sub(pos, pos):match("[%-0-9.eE+]") do
+    pos = pos + 1
+  end
+  return tonumber(str:sub(start, pos - 1)), pos
+end
 
-    local char = str:sub(pos, pos)
+local function decodeObject(str, pos)
+  local obj = {}
+  pos = skipWhitespace(str, pos + 1)
 
-    if char == '"' then
-      pos = pos + 1
-      local start = pos
-      while pos <= #str do
-        if str:sub(pos, pos) == '"' and str:sub(pos - 1, pos - 1) ~= '\\' then
-          local result = str:sub(start, pos - 1)
-          result = result:gsub('\\t', '\t'):gsub('\\r', '\r'):gsub('\\n', '\n'):gsub('\\"', '"'):gsub('\\\\', '\\')
-          pos = pos + 1
-          return result
-        end
-        pos = pos + 1
-      end
-      error("Unterminated string")
+  if str:sub(pos, pos) == "}" then
+    return obj, pos + 1
+  end
 
-    elseif char:match("[%-0-9]") then
-      local start = pos
-      while pos <= #str and str:sub(pos, pos):match("[%-0-9.eE+]") do
-        pos = pos + 1
-      end
-      return tonumber(str:sub(start, pos - 1))
+  while true do
+    pos = skipWhitespace(str, pos)
 
-    elseif str:sub(pos, pos + 3) == "true" then
-      pos = pos + 4
-      return true
-    elseif str:sub(pos, pos + 4) == "false" then
-      pos = pos + 5
-      return false
-    elseif str:sub(pos, pos + 3) == "null" then
-      pos = pos + 4
-      return nil
+    if str:sub(pos, pos) ~= '"' then
+      error("Expected string key")
+    end
+    local key
+    key, pos = decodeString(str, pos)
 
-    elseif char == "{" then
-      local obj = {}
-      pos = pos + 1
-      skip_whitespace()
+    pos = skipWhitespace(str, pos)
+    if str:sub(pos, pos) ~= ":" then
+      error("Expected colon")
+    end
 
-      if str:sub(pos, pos) == "}" then
-        pos = pos + 1
-        return obj
-      end
+    local value
+    value, pos = decodeValue(str, pos + 1)
+    obj[key] = value
 
-      while true do
-        skip_whitespace()
+    pos = skipWhitespace(str, pos)
+    local separator = str:sub(pos, pos)
+    if separator == "}" then
+      return obj, pos + 1
+    elseif separator == "," then
+      pos = pos + 1
+    else
+      error("Expected comma or closing brace")
+    end
+  end
+end
 
-        if str:sub(pos, pos) ~= '"' then
-          error("Expected string key")
-        end
-        local key = decode_value()
+local function decodeArray(str, pos)
+  local arr = {}
+  pos = skipWhitespace(str, pos + 1)
 
-        skip_whitespace()
-        if str:sub(pos, pos) ~= ":" then
-          error("Expected colon")
-        end
-        pos = pos + 1
-
-        local value = decode_value()
-        obj[key] = value
-
-        skip_whitespace()
-        local separator = str:sub(pos, pos)
-        if separator == "}" then
-          pos = pos + 1
-          return obj
-        elseif separator == "," then
-          pos = pos + 1
-        else
-          error("Expected comma or closing brace")
-        end
-      end
+  if str:sub(pos, pos) == "]" then
+    return arr, pos + 1
+  end
+
+  while true do
+    local value
+    value, pos = decodeValue(str, pos)
+    table.insert(arr, value)
 
-    elseif char == "[" then
-      local arr = {}
+    pos = skipWhitespace(str, pos)
+    local separator = str:sub(pos, pos)
+    if separator == "]" then
+      return arr, pos + 1
+    elseif separator == "," then
       pos = pos + 1
-      skip_whitespace()
+    else
+      error("Expected comma or closing bracket")
+    end
+  end
+end
 
-      if str:sub(pos, pos) == "]" then
-        pos = pos + 1
-        return arr
-      end
+-- Literal keywords: the byte that starts them, the full word and its value
+local function literalDecoder(word, value)
+  local len = #word
+  return function(str, pos)
+    if str:sub(pos, pos + len - 1) ~= word then
+      error("Unexpected character: " .. str:sub(pos, pos))
+    end
+    return value, pos + len
+  end
+end
 
-      while true do
-        table.insert(arr, decode_value())
-
-        skip_whitespace()
-        local separator = str:sub(pos, pos)
-        if separator == "]" then
-          pos = pos + 1
-          return arr
-        elseif separator == "," then
-          pos = pos + 1
-        else
-          error("Expected comma or closing bracket")
-        end
-      end
+-- Value parser per leading byte, replacing a chain of per-value comparisons
+local VALUE_DECODERS = {
+  [string.byte('"')] = decodeString,
+  [string.byte("{")] = decodeObject,
+  [string.byte("[")] = decodeArray,
+  [string.byte("-")] = decodeNumber,
+  [string.byte("t")] = literalDecoder("true", true),
+  [string.byte("f")] = literalDecoder("false", false),
+  [string.byte("n")] = literalDecoder("null", nil),
+}
+for b = string.byte("0"), string.byte("9") do
+  VALUE_DECODERS[b] = decodeNumber
+end
 
-    else
-      error("Unexpected character: " .. char)
-    end
+decodeValue = function(str, pos)
+  pos = skipWhitespace(str, pos)
+  local decoder = VALUE_DECODERS[str:byte(pos)]
+  if not decoder then
+    error("Unexpected character: " .. str:sub(pos, pos))
   end
+  return decoder(str, pos)
+end
 
-  return decode_value()
+function JSON.decode(str)
+  str = str:match("^%s*(.-)%s*$")
+  return (decodeValue(str, 1))
 end
 
 -- Network Module
@@ -172,6 +223,7 @@ local connected = false
 local receiveBuffer = ""      -- Raw bytes buffer for incomplete lines
 local incomingMessages = {}   -- Decoded messages ready to be consumed
 local outgoingBuffer = {}     -- Messages queued for sending
+local sendBuffer = ""         -- Encoded bytes not yet accepted by the socket
 
 -- Reconnection / connection state machine
 local CONNECT_STATE = {
@@ -202,6 +254,7 @@ local function markDisconnected()
   receiveBuffer = ""
   incomingMessages = {}
   outgoingBuffer = {}
+  sendBuffer = ""
   if connectionState ~= CONNECT_STATE.RETRY_WAIT then
     setConnectionState(CONNECT_STATE.DISCONNECTED)
   end
@@ -311,6 +364,7 @@ local function connectInternal(host, port, resetReconnectCounters)
   setConnectionState(CONNECT_STATE.CONNECTING)
   closeSocket()
   receiveBuffer = ""
+  sendBuffer = ""
 
   local connectedSock = createSocketAndConnect(host, port)
   if not connectedSock then
@@ -359,25 +413,53 @@ end
   Call once per frame
 ]]
 function Network.flush()
-  if not connected or not sock or #outgoingBuffer == 0 then
+  if not connected or not sock then
+    return true
+  end
+  if #outgoingBuffer == 0 and #sendBuffer == 0 then
     return true
   end
 
-  for _, message in ipairs(outgoingBuffer) do
-    local ok, jsonStr = pcall(JSON.encode, message)
-    if ok then
-      local sendOk, sendErr = pcall(function()
-        sock:send(jsonStr .. "\n")
-      end)
-      if not sendOk then
-        -- Send failed — connection lost
-        markDisconnected()
-        return false
+  -- Encode the whole queue into one newline-delimited payload so a frame's
+  -- messages go out in a single socket write instead of one per message
+  if #outgoingBuffer > 0 then
+    local lines = {}
+    for _, message in ipairs(outgoingBuffer) do
+      local ok, jsonStr = pcall(JSON.encode, message)
+      if ok then
+        lines[#lines + 1] = jsonStr
       end
     end
+    if #lines > 0 then
+      sendBuffer = sendBuffer .. table.concat(lines, "\n") .. "\n"
+    end
+    outgoingBuffer = {}
+  end
+  if #sendBuffer == 0 then
+    return true
   end
 
-  outgoingBuffer = {}
+  local sendOk, sent, sendErr = pcall(sock.send, sock, sendBuffer)
+  if not sendOk then
+    -- Send failed — connection lost
+    markDisconnected()
+    return false
+  end
+  if sent == nil then
+    if sendErr and (not socket or not socket.ERRORS or sendErr ~= socket.ERRORS.AGAIN) then
+      markDisconnected()
+      return false
+    end
+    -- Would block: keep everything for the next flush
+    return true
+  end
+
+  -- Short write: keep the unsent tail (possibly mid-line) so the stream stays intact
+  if type(sent) == "number" and sent < #sendBuffer then
+    sendBuffer = sendBuffer:sub(sent + 1)
+  else
+    sendBuffer = ""
+  end
   return true
 end
 
@@ -493,6 +575,7 @@ function Network.disconnect()
   receiveBuffer = ""
   incomingMessages = {}
   outgoingBuffer = {}
+  sendBuffer = ""
   reconnectAttempts = 0
   reconnectNextTime = 0
 end
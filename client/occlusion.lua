@@ -24,24 +24,33 @@ local bgConfig = nil
 local bgScrollX = 0
 local bgScrollY = 0
 
--- Tile pixel cache: key -> table grouped by color for efficient Painter calls
+-- Tile pixel cache: tile key -> table grouped by color for efficient Painter calls
 -- Format: { {color=0xAARRGGBB, pts={{dx,dy}, ...}}, ... }
 -- false = tile was checked and is fully transparent (skip)
 local tilePixelCache = {}
 local tilePixelCacheCount = 0
 local MAX_CACHE_SIZE = 256
 
+-- Memoized conversions keyed by raw palette halfword (bounded: at most 65536 entries)
+local argbByBgr555 = {}
+
 --[[
   Convert BGR555 (GBA palette format) to ARGB 0xAARRGGBB
 ]]
 local function bgr555ToARGB(bgr555)
+  local argb = argbByBgr555[bgr555]
+  if argb then
+    return argb
+  end
   local r5 = bgr555 & 0x1F
   local g5 = (bgr555 >> 5) & 0x1F
   local b5 = (bgr555 >> 10) & 0x1F
   local r8 = (r5 << 3) | (r5 >> 2)
   local g8 = (g5 << 3) | (g5 >> 2)
   local b8 = (b5 << 3) | (b5 >> 2)
-  return 0xFF000000 | (r8 << 16) | (g8 << 8) | b8
+  argb = 0xFF000000 | (r8 << 16) | (g8 << 8) | b8
+  argbByBgr555[bgr555] = argb
+  return argb
 end
 
 --[[
@@ -62,39 +71,40 @@ local function decodeTilePixels(tileData, palette, hFlip, vFlip)
     for px = 0, 3 do  -- 4bpp: 2 pixels per byte
       local byteOffset = py * 4 + px
       local b = string.byte(tileData, byteOffset + 1)
-      if not b then b = 0 end
-
-      local leftIdx = b & 0x0F
-      local rightIdx = (b >> 4) & 0x0F
-
-      local x0, x1, y
-      if hFlip then
-        x0 = 7 - (px * 2 + 1)
-        x1 = x0 + 1
-      else
-        x0 = px * 2
-        x1 = x0 + 1
-      end
-      y = vFlip and (7 - py) or py
-
-      -- Left pixel (or right if hFlip)
-      local idx1 = hFlip and rightIdx or leftIdx
-      if idx1 ~= 0 then
-        local c = palette[idx1] or 0xFF000000
-        if not colorMap[c] then colorMap[c] = {} end
-        local pts = colorMap[c]
-        pts[#pts + 1] = {x0, y}
-        hasPixels = true
-      end
+      -- Zero byte (or missing data): both pixels transparent, nothing to collect
+      if b and b ~= 0 then
+        local leftIdx = b & 0x0F
+        local rightIdx = (b >> 4) & 0x0F
+
+        local x0, x1, y
+        if hFlip then
+          x0 = 7 - (px * 2 + 1)
+          x1 = x0 + 1
+        else
+          x0 = px * 2
+          x1 = x0 + 1
+        end
+        y = vFlip and (7 - py) or py
+
+        -- Left pixel (or right if hFlip)
+        local idx1 = hFlip and rightIdx or leftIdx
+        if idx1 ~= 0 then
+          local c = palette[idx1] or 0xFF000000
+          if not colorMap[c] then colorMap[c] = {} end
+          local pts = colorMap[c]
+          pts[#pts + 1] = {x0, y}
+          hasPixels = true
+        end
 
-      -- Right pixel (or left if hFlip)
-      local idx2 = hFlip and leftIdx or rightIdx
-      if idx2 ~= 0 then
-        local c = palette[idx2] or 0xFF000000
-        if not colorMap[c] then colorMap[c] = {} end
-        local pts = colorMap[c]
-        pts[#pts + 1] = {x1, y}
-        hasPixels = true
+        -- Right pixel (or left if hFlip)
+        local idx2 = hFlip and leftIdx or rightIdx
+        if idx2 ~= 0 then
+          local c = palette[idx2] or 0xFF000000
+          if not colorMap[c] then colorMap[c] = {} end
+          local pts = colorMap[c]
+          pts[#pts + 1] = {x1, y}
+          hasPixels = true
+        end
       end
     end
   end
@@ -113,11 +123,14 @@ end
 
 --[[
   Get or build cached pixel data for a tile.
+  @param charBase number BG char base block
+  @param entry    number Raw u16 tilemap entry (tile id, flips, palette bank)
   @return color-grouped pixel array or nil if tile is empty/transparent
 ]]
-local function getCachedTilePixels(charBase, tileId, palBank, hFlip, vFlip)
-  local key = string.format("%d_%d_%d_%s_%s", charBase, tileId, palBank,
-    hFlip and "1" or "0", vFlip and "1" or "0")
+local function getCachedTilePixels(charBase, entry)
+  -- The tilemap entry already packs tile id/flips/palette bank: with the char
+  -- base above it, it is the cache key as-is (fields are only split on a miss)
+  local key = (charBase << 16) | entry
 
   local cached = tilePixelCache[key]
   if cached ~= nil then
@@ -125,6 +138,11 @@ local function getCachedTilePixels(charBase, tileId, palBank, hFlip, vFlip)
     return cached
   end
 
+  local tileId = entry & 0x3FF
+  local hFlip = (entry & 0x400) ~= 0
+  local vFlip = (entry & 0x800) ~= 0
+  local palBank = entry >> 12
+
   -- Enforce cache size limit before adding
   if tilePixelCacheCount >= MAX_CACHE_SIZE then
     tilePixelCache = {}
@@ -139,14 +157,8 @@ local function getCachedTilePixels(charBase, tileId, palBank, hFlip, vFlip)
   end
 
   -- Quick check: if all bytes are zero, tile is fully transparent
-  local allZero = true
-  for i = 1, #tileData do
-    if string.byte(tileData, i) ~= 0 then
-      allZero = false
-      break
-    end
-  end
-  if allZero then
+  -- (pattern search for a non-zero byte runs in C, not a per-byte Lua loop)
+  if not string.find(tileData, "[^\0]") then
     tilePixelCache[key] = false
     return nil
   end
@@ -239,31 +251,32 @@ function Occlusion.drawOcclusionForGhost(painter, ghostX, ghostY, ghostW, ghostH
   painter:setFill(true)
   painter:setStrokeWidth(0)
 
+  -- Resolve the per-pixel/per-tile methods once for this ghost instead of
+  -- looking them up through the painter/HAL tables on every call
+  local setFillColor = painter.setFillColor
+  local drawRectangle = painter.drawRectangle
+  local readTilemapEntry = HAL.readBGTilemapEntry
+
   for ty = tileYStart, tileYEnd do
     for tx = tileXStart, tileXEnd do
-      local entry = HAL.readBGTilemapEntry(screenBase, tx, ty, screenSize)
+      local entry = readTilemapEntry(screenBase, tx, ty, screenSize)
       if entry then
-        local tileId = entry & 0x3FF
-        if tileId ~= 0 then
-          local hFlip = ((entry >> 10) & 1) == 1
-          local vFlip = ((entry >> 11) & 1) == 1
-          local palBank = (entry >> 12) & 0xF
-
-          local groups = getCachedTilePixels(charBase, tileId, palBank, hFlip, vFlip)
+        if entry & 0x3FF ~= 0 then
+          local groups = getCachedTilePixels(charBase, entry)
           if groups then
             local baseX = tx * 8 - bgScrollX
             local baseY = ty * 8 - bgScrollY
             -- Draw pixels grouped by color (minimizes setFillColor calls)
             for g = 1, #groups do
               local grp = groups[g]
-              painter:setFillColor(grp.color)
+              setFillColor(painter, grp.color)
               local pts = grp.pts
               for i = 1, #pts do
                 local p = pts[i]
                 local sx = baseX + p[1]
                 local sy = baseY + p[2]
                 if sx >= 0 and sx < 240 and sy >= 0 and sy < 160 then
-                  painter:drawRectangle(sx, sy, 1, 1)
+                  drawRectangle(painter, sx, sy, 1, 1)
                 end
               end
             end
@@ -8,6 +8,7 @@
 ]]
 
 local HAL = require("hal")
+local Interpolate = require("interpolate")
 
 local Sprite -- forward declaration, set via Render.setSprite()
 
@@ -166,20 +167,30 @@ local function isRenderableGhostForOverlay(ghost)
     return true
 end
 
+-- width -> height -> SHAPE_SIZE_LOOKUP entry (false = unsupported size), so
+-- per-ghost per-frame lookups skip string.format
+local shapeSizeByDimensions = {}
+
 local function oamShapeSizeForDimensions(width, height)
-    return SHAPE_SIZE_LOOKUP[string.format("%dx%d", width, height)]
+    local byHeight = shapeSizeByDimensions[width]
+    local entry = byHeight and byHeight[height]
+    if entry == nil then
+        entry = SHAPE_SIZE_LOOKUP[string.format("%dx%d", width, height)] or false
+        if not byHeight then
+            byHeight = {}
+            shapeSizeByDimensions[width] = byHeight
+        end
+        byHeight[height] = entry
+    end
+    return entry or nil
 end
 
 local function isSameMap(pos, currentMap)
     return pos.mapId == currentMap.mapId and pos.mapGroup == currentMap.mapGroup
 end
 
-local function buildMapKey(mapGroup, mapId)
-    if mapGroup == nil or mapId == nil then
-        return nil
-    end
-    return string.format("%d:%d", tonumber(mapGroup) or -1, tonumber(mapId) or -1)
-end
+-- "group:id" map keys, memoized in Interpolate.mapKey (per-ghost per-frame lookups)
+local buildMapKey = Interpolate.mapKey
 
 local function buildMapPairKey(localPos, remotePos)
     local localKey = buildMapKey(localPos and localPos.mapGroup, localPos and localPos.mapId)
@@ -284,6 +295,10 @@ local function normalizeConnection(conn)
     }
 end
 
+-- connections list -> { [mapGroup * 65536 + mapId] = normalized conn }.
+-- Weak keys: entries disappear with the position snapshots that own the lists.
+local connectionIndexCache = setmetatable({}, { __mode = "k" })
+
 local function findConnectionToMap(connections, targetMap)
     if type(connections) ~= "table" or type(targetMap) ~= "table" then
         return nil
@@ -295,13 +310,23 @@ local function findConnectionToMap(connections, targetMap)
         return nil
     end
 
-    for _, rawConn in ipairs(connections) do
-        local conn = normalizeConnection(rawConn)
-        if conn and conn.mapGroup == targetGroup and conn.mapId == targetId then
-            return conn
+    -- Index each connections list once (first match per map wins, as before);
+    -- later frames resolve the target with a single keyed lookup.
+    local index = connectionIndexCache[connections]
+    if not index then
+        index = {}
+        for _, rawConn in ipairs(connections) do
+            local conn = normalizeConnection(rawConn)
+            if conn then
+                local key = conn.mapGroup * 65536 + conn.mapId
+                if index[key] == nil then
+                    index[key] = conn
+                end
+            end
         end
+        connectionIndexCache[connections] = index
     end
-    return nil
+    return index[targetGroup * 65536 + targetId]
 end
 
 local function ensureProjectionState(playerId, remotePos)
@@ -1280,6 +1305,15 @@ function Render.init(config)
     ensureGhostOAMReservation(true)
 end
 
+-- Signed 8-bit delta between two camera values (-128..127), wrapped
+-- branchlessly by offsetting into the unsigned range and back
+local function signedByteDelta(curr, prev)
+    if prev == nil then
+        return 0
+    end
+    return (curr - prev + 128) % 256 - 128
+end
+
 --[[
   Update sub-tile camera correction. Call once per frame before drawing.
 ]]
@@ -1357,16 +1391,6 @@ function Render.updateCamera(playerX, playerY, cameraX, cameraY, mapGroup, mapId
     -- Fallback for seam crossings with wrapped local tile coords (e.g. y 19 -> 0):
     -- infer movement axis from signed camera byte delta when stepDir was not
     -- recoverable from tile delta in this frame.
-    local function signedByteDelta(curr, prev)
-        if prev == nil then
-            return 0
-        end
-        local d = (curr - prev) % 256
-        if d > 127 then
-            d = d - 256
-        end
-        return d
-    end
     local camDeltaX = signedByteDelta(camXByte, prevCamForDeltaX)
     local camDeltaY = signedByteDelta(camYByte, prevCamForDeltaY)
     if stepDirX == 0 and phaseX ~= 0 then
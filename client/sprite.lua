@@ -20,6 +20,15 @@ local SIZE_TABLE = {
   [2] = { [0] = {8,16},  [1] = {8,32},  [2] = {16,32}, [3] = {32,64} },
 }
 
+-- SIZE_TABLE flattened by the combined (shape << 2) | sizeCode OAM bits, so
+-- entry parsing does one lookup instead of two
+local SIZE_BY_SHAPE_SIZE = {}
+for shape, sizes in pairs(SIZE_TABLE) do
+  for sizeCode, dims in pairs(sizes) do
+    SIZE_BY_SHAPE_SIZE[(shape << 2) | sizeCode] = dims
+  end
+end
+
 -- Ghost opacity (0x00=invisible, 0xFF=opaque). Applied to remote sprites only.
 local GHOST_ALPHA = 0xFF  -- Fully opaque
 local DEFAULT_PLAYER_CANDIDATE_MAX_DIST = 40
@@ -58,33 +67,62 @@ local remoteCache = {}
 -- No cached OAM index — OAM indices shuffle every frame.
 -- We find the player by lowest tileIndex + screen position each frame.
 
+-- Memoized conversions keyed by raw palette halfword (bounded: at most 65536 entries)
+local argbByBgr555 = {}
+
 --[[
   Convert BGR555 (GBA palette format) to ARGB 0xAARRGGBB
 ]]
 local function bgr555ToARGB(bgr555)
+  local argb = argbByBgr555[bgr555]
+  if argb then
+    return argb
+  end
   local r5 = bgr555 & 0x1F
   local g5 = (bgr555 >> 5) & 0x1F
   local b5 = (bgr555 >> 10) & 0x1F
   local r8 = (r5 << 3) | (r5 >> 2)
   local g8 = (g5 << 3) | (g5 >> 2)
   local b8 = (b5 << 3) | (b5 >> 2)
-  return 0xFF000000 | (r8 << 16) | (g8 << 8) | b8
+  argb = 0xFF000000 | (r8 << 16) | (g8 << 8) | b8
+  argbByBgr555[bgr555] = argb
+  return argb
 end
 
+-- Memoized conversions keyed by the 24-bit RGB part (alpha never affects the result)
+local bgr555ByRgb = {}
+
 local function argbToBgr555(color)
-  local c = tonumber(color) or 0
-  local r8 = (c >> 16) & 0xFF
-  local g8 = (c >> 8) & 0xFF
-  local b8 = c & 0xFF
-  local r5 = math.floor((r8 + 4) / 8) & 0x1F
-  local g5 = math.floor((g8 + 4) / 8) & 0x1F
-  local b5 = math.floor((b8 + 4) / 8) & 0x1F
-  return r5 | (g5 << 5) | (b5 << 10)
+  local rgb = (tonumber(color) or 0) & 0xFFFFFF
+  local bgr = bgr555ByRgb[rgb]
+  if bgr then
+    return bgr
+  end
+  local r5 = (((rgb >> 16) + 4) >> 3) & 0x1F
+  local g5 = ((((rgb >> 8) & 0xFF) + 4) >> 3) & 0x1F
+  local b5 = (((rgb & 0xFF) + 4) >> 3) & 0x1F
+  bgr = r5 | (g5 << 5) | (b5 << 10)
+  bgr555ByRgb[rgb] = bgr
+  return bgr
 end
 
 local function hashString(bytes)
   local h = 2166136261
-  for i = 1, #bytes do
+  local len = #bytes
+  -- Tile data comes in 32-byte tiles: pull 8 bytes per string.byte call
+  local blockEnd = len - len % 8
+  for i = 1, blockEnd, 8 do
+    local b1, b2, b3, b4, b5, b6, b7, b8 = string.byte(bytes, i, i + 7)
+    h = ((h ~ b1) * 16777619) & 0xFFFFFFFF
+    h = ((h ~ b2) * 16777619) & 0xFFFFFFFF
+    h = ((h ~ b3) * 16777619) & 0xFFFFFFFF
+    h = ((h ~ b4) * 16777619) & 0xFFFFFFFF
+    h = ((h ~ b5) * 16777619) & 0xFFFFFFFF
+    h = ((h ~ b6) * 16777619) & 0xFFFFFFFF
+    h = ((h ~ b7) * 16777619) & 0xFFFFFFFF
+    h = ((h ~ b8) * 16777619) & 0xFFFFFFFF
+  end
+  for i = blockEnd + 1, len do
     h = ((h ~ string.byte(bytes, i)) * 16777619) & 0xFFFFFFFF
   end
   return h
@@ -124,14 +162,17 @@ local function clampNumber(value, minValue, maxValue, fallback)
   return n
 end
 
+-- Pack the identifying OAM fields of a candidate into one integer (compared
+-- every frame): tile index in the high bits, 8 bits for each other field,
+-- offset by 1 where the default is -1
 local function candidateSignature(entry)
-  return string.format("%d:%d:%d:%d:%d",
-    tonumber(entry and entry.tileIndex) or -1,
-    tonumber(entry and entry.palBank) or -1,
-    tonumber(entry and entry.width) or 0,
-    tonumber(entry and entry.height) or 0,
-    tonumber(entry and entry.priority) or -1
-  )
+  local tileIndex = tonumber(entry and entry.tileIndex) or -1
+  local palBank = tonumber(entry and entry.palBank) or -1
+  local width = tonumber(entry and entry.width) or 0
+  local height = tonumber(entry and entry.height) or 0
+  local priority = tonumber(entry and entry.priority) or -1
+  return ((tileIndex + 1) << 32) | ((palBank + 1) << 24) | (width << 16)
+    | (height << 8) | (priority + 1)
 end
 
 local function evaluateCandidateConfidence(candidates, chosen)
@@ -188,11 +229,8 @@ local function parseOAMEntry(attr0, attr1, attr2)
   local shape = (attr0 >> 14) & 0x3
   local is4bpp = ((attr0 >> 13) & 0x1) == 0
 
-  local xPos = attr1 & 0x1FF
-  -- Sign-extend 9-bit X position
-  if xPos >= 256 then
-    xPos = xPos - 512
-  end
+  -- 9-bit X position, sign-extended branchlessly (flip bit 8, subtract it)
+  local xPos = ((attr1 & 0x1FF) ~ 0x100) - 0x100
   local hFlip = ((attr1 >> 12) & 0x1) == 1
   local vFlip = ((attr1 >> 13) & 0x1) == 1
   local sizeCode = (attr1 >> 14) & 0x3
@@ -202,7 +240,7 @@ local function parseOAMEntry(attr0, attr1, attr2)
   local palBank = (attr2 >> 12) & 0xF
 
   -- Look up dimensions
-  local sizeEntry = SIZE_TABLE[shape] and SIZE_TABLE[shape][sizeCode]
+  local sizeEntry = SIZE_BY_SHAPE_SIZE[(shape << 2) | sizeCode]
   if not sizeEntry then
     return nil
   end
@@ -235,10 +273,17 @@ end
 ]]
 local function findPlayerOAM()
   local candidates = {}
+  -- All 128 entries in one read; per-entry reads only if the block read fails
+  local oamTable = HAL.readOAMTable and HAL.readOAMTable()
 
   for i = 0, 127 do
     if not (HAL.isGhostReservedOAMIndex and HAL.isGhostReservedOAMIndex(i)) then
-      local attr0, attr1, attr2 = HAL.readOAMEntry(i)
+      local attr0, attr1, attr2
+      if oamTable then
+        attr0, attr1, attr2 = string.unpack("<I2I2I2", oamTable, i * 8 + 1)
+      else
+        attr0, attr1, attr2 = HAL.readOAMEntry(i)
+      end
       local entry = parseOAMEntry(attr0, attr1, attr2)
 
       -- Accept 16x32 (walk/run: shape=2) and 32x32 (bike: shape=0), both sizeCode=2
@@ -315,33 +360,41 @@ local function buildImage(tileBytes, palette, width, height, hFlip, vFlip, alpha
   local heightTiles = height / 8
   local numTiles = widthTiles * heightTiles
 
+  -- Per-pixel invariants, computed once instead of on every pixel
+  local setPixel = img.setPixel
+  local applyAlpha = alpha and alpha ~= 0xFF
+  local alphaBits = applyAlpha and (alpha << 24) or 0
+
+  -- Unpack every tile byte with one string.byte call instead of one per byte
+  local tileArray = { string.byte(tileBytes, 1, numTiles * 32) }
+
   for tileIdx = 0, numTiles - 1 do
     local tileRow = math.floor(tileIdx / widthTiles)
     local tileCol = tileIdx % widthTiles
     local baseOffset = tileIdx * 32
+    local tileX = tileCol * 8
+    local tileY = tileRow * 8
 
     for py = 0, 7 do
+      local rowOffset = baseOffset + py * 4
+      local sy = tileY + py
+      if vFlip then
+        sy = height - 1 - sy
+      end
+
       for px = 0, 3 do -- 4bpp: 2 pixels per byte
-        local byteOffset = baseOffset + py * 4 + px
-        local b = string.byte(tileBytes, byteOffset + 1) -- Lua 1-indexed
-        if not b then b = 0 end
+        local b = tileArray[rowOffset + px + 1] or 0 -- Lua 1-indexed
 
         local leftPixel = b & 0x0F
         local rightPixel = (b >> 4) & 0x0F
 
-        local sx0 = tileCol * 8 + px * 2
-        local sx1 = sx0 + 1
-        local sy = tileRow * 8 + py
-
+        local sx0 = tileX + px * 2
         -- Apply flips
         if hFlip then
           -- Mirror horizontally: swap positions AND pixel order
-          sx0 = width - 1 - (tileCol * 8 + px * 2 + 1)
-          sx1 = sx0 + 1
-        end
-        if vFlip then
-          sy = height - 1 - sy
+          sx0 = width - 1 - (sx0 + 1)
         end
+        local sx1 = sx0 + 1
 
         -- Set pixels (palette index 0 = transparent)
         local color0 = palette[leftPixel] or 0x00000000
@@ -350,22 +403,22 @@ local function buildImage(tileBytes, palette, width, height, hFlip, vFlip, alpha
         if rightPixel == 0 then color1 = 0x00000000 end
 
         -- Apply alpha override to non-transparent pixels
-        if alpha and alpha ~= 0xFF then
+        if applyAlpha then
           if leftPixel ~= 0 then
-            color0 = (alpha << 24) | (color0 & 0x00FFFFFF)
+            color0 = alphaBits | (color0 & 0x00FFFFFF)
           end
           if rightPixel ~= 0 then
-            color1 = (alpha << 24) | (color1 & 0x00FFFFFF)
+            color1 = alphaBits | (color1 & 0x00FFFFFF)
           end
         end
 
         if hFlip then
           -- When flipped, right pixel goes to lower X position
-          pcall(img.setPixel, img, sx0, sy, color1)
-          pcall(img.setPixel, img, sx1, sy, color0)
+          pcall(setPixel, img, sx0, sy, color1)
+          pcall(setPixel, img, sx1, sy, color0)
         else
-          pcall(img.setPixel, img, sx0, sy, color0)
-          pcall(img.setPixel, img, sx1, sy, color1)
+          pcall(setPixel, img, sx0, sy, color0)
+          pcall(setPixel, img, sx1, sy, color1)
         end
       end
     end
@@ -519,10 +572,8 @@ function Sprite.getLocalSpriteData()
   end
 
   -- Convert tile string to array of numbers for JSON serialization
-  local tileArray = {}
-  for i = 1, #localCache.tileBytes do
-    tileArray[i] = string.byte(localCache.tileBytes, i)
-  end
+  -- (one string.byte call unpacks the whole buffer on the C side)
+  local tileArray = { string.byte(localCache.tileBytes, 1, -1) }
 
   -- Convert 0-indexed palette to 1-indexed array for JSON serialization
   -- (Lua JSON encoders use ipairs for arrays, which starts at index 1)
@@ -577,25 +628,21 @@ function Sprite.updateFromNetwork(playerId, data)
   -- Palette data can arrive as:
   -- - paletteBgr (preferred for OAM injection)
   -- - palette ARGB (legacy path, converted back to BGR555)
-  local palette = {}
+  -- Two passes: the BGR555 palette feeds the change hash, and the ARGB palette
+  -- is only built once the sprite is known to have changed (most updates
+  -- repeat the cached sprite and return early).
   local paletteBgr = {}
   local hasPalette = type(data.palette) == "table"
   local hasPaletteBgr = type(data.paletteBgr) == "table"
 
   for i = 0, 15 do
     if i == 0 then
-      palette[i] = 0x00000000
       paletteBgr[i] = 0
     else
-      local argb = hasPalette and (data.palette[i + 1] or 0x00000000) or 0x00000000
       local bgr = hasPaletteBgr and (data.paletteBgr[i + 1] or 0) or nil
       if bgr == nil then
-        bgr = argbToBgr555(argb)
-      end
-      if not hasPalette then
-        argb = bgr555ToARGB(bgr)
+        bgr = argbToBgr555(hasPalette and (data.palette[i + 1] or 0x00000000) or 0x00000000)
       end
-      palette[i] = argb
       paletteBgr[i] = bgr
     end
   end
@@ -606,6 +653,17 @@ function Sprite.updateFromNetwork(playerId, data)
     return
   end
 
+  local palette = {}
+  for i = 0, 15 do
+    if i == 0 then
+      palette[i] = 0x00000000
+    elseif hasPalette then
+      palette[i] = data.palette[i + 1] or 0x00000000
+    else
+      palette[i] = bgr555ToARGB(paletteBgr[i])
+    end
+  end
+
   local img = buildImage(tileBytes, palette, width, height, hFlip, vFlip, GHOST_ALPHA)
 
   remoteCache[playerId] = {
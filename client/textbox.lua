@@ -54,9 +54,18 @@ CHAR_MAP[string.byte(",")] = 0xB8
 CHAR_MAP[string.byte("/")] = 0xBA
 CHAR_MAP[string.byte(":")] = 0xF0
 CHAR_MAP[string.byte("'")] = 0xB3
+-- Fill the rest of the 256 byte values with 0x00 (unsupported chars encode as
+-- a space), so encoding is a single lookup per character
+for c = 0, 255 do
+  if not CHAR_MAP[c] then CHAR_MAP[c] = 0x00 end
+end
 local CHAR_NEWLINE = 0xFE
 local CHAR_EOS = 0xFF
 
+-- ASCII codes of the "\\n" escape, resolved once instead of per character
+local BYTE_BACKSLASH = string.byte("\\")
+local BYTE_N = string.byte("n")
+
 -- Reverse mapping: GBA byte → ASCII char (for decoding names from SaveBlock2)
 local GBA_TO_ASCII = {}
 GBA_TO_ASCII[0x00] = " "
@@ -120,14 +129,11 @@ local function encodeText(str)
   local i = 1
   while i <= #str do
     local c = str:byte(i)
-    if c == string.byte("\\") and i < #str and str:byte(i+1) == string.byte("n") then
+    if c == BYTE_BACKSLASH and i < #str and str:byte(i+1) == BYTE_N then
       bytes[#bytes + 1] = CHAR_NEWLINE
       i = i + 2
-    elseif CHAR_MAP[c] then
-      bytes[#bytes + 1] = CHAR_MAP[c]
-      i = i + 1
     else
-      bytes[#bytes + 1] = 0x00
+      bytes[#bytes + 1] = CHAR_MAP[c]
       i = i + 1
     end
   end
@@ -484,12 +490,12 @@ end
   @return string  ASCII text
 ]]
 function Textbox.decodeGBAText(bytes)
-  local result = ""
+  local chars = {}
   for _, b in ipairs(bytes) do
     if b == 0xFF then break end
-    result = result .. (GBA_TO_ASCII[b] or "")
+    chars[#chars + 1] = GBA_TO_ASCII[b] or ""
   end
-  return result
+  return table.concat(chars)
 end
 
 return Textbox